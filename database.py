@@ -10,12 +10,31 @@ import time
 
 logger = logging.getLogger(__name__)
 
+# Einmal vorgebautes INSERT für die trades-Tabelle (kein String-Aufbau pro Aufruf)
+_TRADE_INSERT_SQL = '''
+    INSERT INTO trades
+    (date, symbol, leverage, entry_price, position, quantity, stop_loss,
+    take_profit_1, take_profit_2, take_profit_3, take_profit_4,
+    order_ids, risk_amount, confidence, risk_reward_ratio)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+'''
+
 class AdvancedDatabaseManager:
     def __init__(self, db_path='trading_bot.db'):
         self.db_path = db_path
         self._lock = threading.RLock()
         self._connection_pool = {}
         self.max_pool_size = 5
+        # Konfigurierbare Pragmas für neue Connections: synchronous auf
+        # 'FULL' stellen, wenn strikte Durability wichtiger ist als
+        # Schreib-Latenz (WAL + NORMAL = fsync-arm, aber crash-sicher)
+        self.pragmas = {
+            'journal_mode': 'WAL',
+            'synchronous': 'NORMAL',
+            'cache_size': -64000,
+            'temp_store': 'MEMORY',
+            'mmap_size': 268435456,
+        }
         self.init_database()
     
     @contextmanager
@@ -43,12 +62,16 @@ class AdvancedDatabaseManager:
                 
                 # Erstelle neue Connection falls nötig
                 if conn is None:
-                    conn = sqlite3.connect(self.db_path, timeout=30.0)
+                    # cached_statements: sqlite3 hält vorbereitete Statements
+                    # pro SQL-String im Cache - zusammen mit den Modul-
+                    # Konstanten (z.B. _TRADE_INSERT_SQL) wird dasselbe
+                    # Statement nur einmal geparst
+                    conn = sqlite3.connect(self.db_path, timeout=30.0,
+                                           cached_statements=256)
                     conn.row_factory = sqlite3.Row
                     conn.execute("PRAGMA foreign_keys = ON")
-                    conn.execute("PRAGMA journal_mode = WAL")
-                    conn.execute("PRAGMA synchronous = NORMAL")
-                    conn.execute("PRAGMA cache_size = -64000")
+                    for pragma, value in self.pragmas.items():
+                        conn.execute(f"PRAGMA {pragma} = {value}")
                     
                     # Füge zur Pool hinzu wenn Platz vorhanden
                     if len(self._connection_pool) < self.max_pool_size:
@@ -221,13 +244,7 @@ class AdvancedDatabaseManager:
                     return False
                 
                 # KORRIGIERTER Insert mit allen Feldern
-                cursor.execute('''
-                    INSERT INTO trades 
-                    (date, symbol, leverage, entry_price, position, quantity, stop_loss, 
-                    take_profit_1, take_profit_2, take_profit_3, take_profit_4, 
-                    order_ids, risk_amount, confidence, risk_reward_ratio)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                ''', (
+                cursor.execute(_TRADE_INSERT_SQL, (
                     date, symbol.upper(), leverage, price, positionSide, qty, stoploss, 
                     tk1, tk2, tk3, tk4, ordersID, risk_amount, confidence, risk_reward
                 ))
@@ -243,6 +260,52 @@ class AdvancedDatabaseManager:
             logger.error(f"❌ Unexpected error saving new trade {symbol}: {e}")
             return False
     
+    def new_trades_db_batch(self, rows: List[Tuple]) -> Dict[str, bool]:
+        """Speichert mehrere Trade-Zeilen in EINER Transaktion via executemany.
+
+        Jede Zeile ist ein Positions-Tupel in der Spaltenreihenfolge von
+        _TRADE_INSERT_SQL - keine Dict-Allokation pro Insert.
+
+        False in den Results bedeutet ausschließlich "Duplikat" (es
+        existiert bereits ein aktiver Trade für das Symbol). Echte
+        DB-Fehler werden NICHT geschluckt, sondern propagiert, damit der
+        Aufrufer seinen Einzel-Insert-/Emergency-Fallback fahren kann.
+        """
+        results: Dict[str, bool] = {}
+        if not rows:
+            return results
+        try:
+            with self._get_connection() as conn:
+                cursor = conn.cursor()
+
+                # Duplikat-Prüfung EINMAL für den ganzen Batch statt pro Zeile
+                cursor.execute('SELECT symbol FROM trades WHERE active = 1')
+                existing = {row['symbol'] for row in cursor.fetchall()}
+
+                to_insert = []
+                for row in rows:
+                    symbol = row[1].upper()
+                    if symbol in existing:
+                        logger.warning(f"⚠️ Active trade already exists for {symbol}")
+                        results[symbol] = False
+                        continue
+                    existing.add(symbol)
+                    if row[1] != symbol:
+                        row = row[:1] + (symbol,) + row[2:]
+                    to_insert.append(row)
+                    results[symbol] = True
+
+                if to_insert:
+                    cursor.executemany(_TRADE_INSERT_SQL, to_insert)
+                    conn.commit()
+                    logger.info(f"✅ Batch saved: {len(to_insert)} trades in one transaction")
+
+                return results
+
+        except sqlite3.Error as e:
+            logger.error(f"❌ Database error saving trade batch: {e}")
+            raise
+
     def get_trade_db(self, symbol: str) -> Optional[Dict[str, Any]]:
         """Holt Trade-Daten für ein Symbol als Dictionary - VOLLSTÄNDIG ROBUST"""
         try:
@@ -261,64 +324,13 @@ class AdvancedDatabaseManager:
                 
                 row = cursor.fetchone()
                 if row:
-                    # Konvertiere sqlite3.Row zu Dictionary
-                    trade_dict = dict(row)
-                    
-                    # VOLLSTÄNDIGE FELD-GARANTIE mit intelligenten Defaults
-                    field_defaults = {
-                        'date': datetime.now().strftime("%d/%m/%Y %H:%M:%S"),
-                        'symbol': symbol.upper(),
-                        'leverage': 1.0,
-                        'entry_price': 0.0,
-                        'position': 'LONG',
-                        'quantity': 0.0,
-                        'stop_loss': 0.0,
-                        'take_profit_1': 0.0,
-                        'take_profit_2': 0.0,
-                        'take_profit_3': 0.0,
-                        'take_profit_4': 0.0,
-                        'active': 1,
-                        'status': 'NEW',
-                        'order_ids': '[]',
-                        'risk_amount': 0.0,
-                        'current_pnl': 0.0,
-                        'pnl_percentage': 0.0,
-                        'confidence': 75.0,
-                        'risk_reward_ratio': 1.0,
-                        'created_at': datetime.now().isoformat(),
-                        'updated_at': datetime.now().isoformat()
-                    }
-                    
-                    for field, default in field_defaults.items():
-                        if field not in trade_dict or trade_dict[field] is None:
-                            logger.warning(f"⚠️ Setting default for missing field {field} in {symbol}")
-                            trade_dict[field] = default
-                    
-                    # PROFESSIONELLE Typ-Konvertierung
-                    try:
-                        if isinstance(trade_dict['order_ids'], str):
-                            trade_dict['order_ids'] = json.loads(trade_dict['order_ids'])
-                        else:
-                            trade_dict['order_ids'] = []
-                    except:
-                        trade_dict['order_ids'] = []
-                    
-                    # Konvertiere Datum-Strings zu datetime Objects falls nötig
-                    for date_field in ['created_at', 'updated_at']:
-                        if date_field in trade_dict and isinstance(trade_dict[date_field], str):
-                            try:
-                                trade_dict[date_field] = datetime.fromisoformat(
-                                    trade_dict[date_field].replace('Z', '+00:00')
-                                )
-                            except:
-                                trade_dict[date_field] = datetime.now()
-                    
+                    trade_dict = self._normalize_trade_row(row, symbol)
                     logger.debug(f"✅ Successfully retrieved COMPLETE trade data for {symbol}")
                     return trade_dict
                 else:
                     logger.warning(f"⚠️ No active trade found for symbol: {symbol}")
                     return None
-                    
+
         except sqlite3.Error as e:
             logger.error(f"❌ Database error getting trade {symbol}: {e}")
             return None
@@ -326,6 +338,93 @@ class AdvancedDatabaseManager:
             logger.error(f"❌ Unexpected error getting trade {symbol}: {e}")
             return None
 
+    def _normalize_trade_row(self, row, symbol: str) -> Dict[str, Any]:
+        """Konvertiert eine trades-Zeile zu einem Dict mit Feld-Garantie"""
+        # Konvertiere sqlite3.Row zu Dictionary
+        trade_dict = dict(row)
+
+        # VOLLSTÄNDIGE FELD-GARANTIE mit intelligenten Defaults
+        field_defaults = {
+            'date': datetime.now().strftime("%d/%m/%Y %H:%M:%S"),
+            'symbol': symbol.upper(),
+            'leverage': 1.0,
+            'entry_price': 0.0,
+            'position': 'LONG',
+            'quantity': 0.0,
+            'stop_loss': 0.0,
+            'take_profit_1': 0.0,
+            'take_profit_2': 0.0,
+            'take_profit_3': 0.0,
+            'take_profit_4': 0.0,
+            'active': 1,
+            'status': 'NEW',
+            'order_ids': '[]',
+            'risk_amount': 0.0,
+            'current_pnl': 0.0,
+            'pnl_percentage': 0.0,
+            'confidence': 75.0,
+            'risk_reward_ratio': 1.0,
+            'created_at': datetime.now().isoformat(),
+            'updated_at': datetime.now().isoformat()
+        }
+
+        for field, default in field_defaults.items():
+            if field not in trade_dict or trade_dict[field] is None:
+                logger.warning(f"⚠️ Setting default for missing field {field} in {symbol}")
+                trade_dict[field] = default
+
+        # PROFESSIONELLE Typ-Konvertierung
+        try:
+            if isinstance(trade_dict['order_ids'], str):
+                trade_dict['order_ids'] = json.loads(trade_dict['order_ids'])
+            else:
+                trade_dict['order_ids'] = []
+        except:
+            trade_dict['order_ids'] = []
+
+        # Konvertiere Datum-Strings zu datetime Objects falls nötig
+        for date_field in ['created_at', 'updated_at']:
+            if date_field in trade_dict and isinstance(trade_dict[date_field], str):
+                try:
+                    trade_dict[date_field] = datetime.fromisoformat(
+                        trade_dict[date_field].replace('Z', '+00:00')
+                    )
+                except:
+                    trade_dict[date_field] = datetime.now()
+
+        return trade_dict
+
+    def get_all_active_trades_db(self) -> Dict[str, Dict[str, Any]]:
+        """Holt ALLE aktiven Trades in EINER Query - für Batch-Evaluierung"""
+        try:
+            with self._get_connection() as conn:
+                cursor = conn.cursor()
+
+                cursor.execute('''
+                    SELECT date, symbol, leverage, entry_price, position, quantity,
+                        stop_loss, take_profit_1, take_profit_2, take_profit_3,
+                        take_profit_4, active, status, order_ids, risk_amount,
+                        current_pnl, pnl_percentage, confidence, risk_reward_ratio,
+                        created_at, updated_at
+                    FROM trades
+                    WHERE active = 1
+                ''')
+
+                trades = {}
+                for row in cursor.fetchall():
+                    trade_dict = self._normalize_trade_row(row, row['symbol'])
+                    trades[trade_dict['symbol']] = trade_dict
+
+                logger.debug(f"✅ Retrieved {len(trades)} active trades in one query")
+                return trades
+
+        except sqlite3.Error as e:
+            logger.error(f"❌ Database error getting active trades: {e}")
+            return {}
+        except Exception as e:
+            logger.error(f"❌ Unexpected error getting active trades: {e}")
+            return {}
+
     def get_active_trades_symbol_db(self) -> List[str]:
         """Holt alle aktiven Trade-Symbole - OPTIMIERTE VERSION"""
         try:
@@ -741,9 +840,19 @@ def new_trade_db(price: float, date: str, symbol: str, leverage: float, qty: flo
                                   qty, stoploss, tk1, tk2, tk3, tk4, ordersID,
                                   risk_amount, confidence, risk_reward)
 
+def new_trades_db_batch(rows: List[Tuple]):
+    return db_manager.new_trades_db_batch(rows)
+
+def new_trade_db_row(row: Tuple):
+    """Einzel-Insert aus einem Positions-Tupel (Spaltenreihenfolge von _TRADE_INSERT_SQL)"""
+    return db_manager.new_trade_db(*row)
+
 def get_trade_db(symbol: str):
     return db_manager.get_trade_db(symbol)
 
+def get_all_active_trades_db():
+    return db_manager.get_all_active_trades_db()
+
 def get_active_trades_symbol_db():
     return db_manager.get_active_trades_symbol_db()
 
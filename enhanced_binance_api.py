@@ -358,6 +358,36 @@ class ProfessionalBinanceAPI:
         
         return round(current_price, 4)
 
+    def get_all_prices_professional(self, symbols: Optional[List[str]] = None) -> Dict[str, float]:
+        """PROFESSIONELLE Bulk-Preisabfrage: EIN Ticker-Abruf für alle Symbole"""
+        if self.offline_mode:
+            return {s: self._get_offline_price_professional(s)
+                    for s in (symbols or list(self.offline_prices))}
+
+        try:
+            def fetch_tickers():
+                if symbols:
+                    return self.exchange.fetch_tickers([s.upper() for s in symbols])
+                return self.exchange.fetch_tickers()
+
+            tickers = self._retry_api_call_professional(fetch_tickers)
+
+            prices = {}
+            for ticker_symbol, ticker in tickers.items():
+                last = ticker.get('last')
+                if last is not None:
+                    # ccxt liefert 'BTC/USDT' — auf internes Format normalisieren
+                    prices[ticker_symbol.replace('/', '')] = float(last)
+
+            logger.debug(f"📊 LIVE Professional bulk prices fetched: {len(prices)} symbols")
+            return prices
+
+        except Exception as e:
+            logger.error(f"❌ LIVE Professional bulk price fetch error: {e}")
+
+            return {s: self._get_offline_price_professional(s)
+                    for s in (symbols or [])}
+
     def get_precision_professional(self, symbol: str) -> Dict[str, int]:
         """PROFESSIONELLE Präzisionsbestimmung für LIVE TRADING"""
         try:
@@ -667,6 +697,9 @@ class ProfessionalBinanceAPI:
     # Kompatibilitätsmethoden für bestehenden Code
     def get_current_price(self, symbol: str) -> float:
         return self.get_current_price_professional(symbol)
+
+    def get_all_prices(self, symbols: Optional[List[str]] = None) -> Dict[str, float]:
+        return self.get_all_prices_professional(symbols)
     
     def validate_symbol(self, symbol: str) -> bool:
         return self.validate_symbol_professional(symbol)
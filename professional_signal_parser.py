@@ -1,802 +1,1164 @@
-import re
-import json
-import logging
-from datetime import datetime
-from typing import Dict, Optional, Tuple, List, Any
-from decimal import Decimal, ROUND_HALF_UP
-from enhanced_binance_api import binance_api
-import os
-# Database imports
-try:
-    from database import new_trade_db, check_and_update_unique_names, check_if_trade_exist
-except ImportError as e:
-    logging.error(f"Database import error: {e}")
-    # Fallback functions for testing
-    def new_trade_db(*args, **kwargs):
-        logging.warning("new_trade_db not available - running in test mode")
-        return True
-    
-    def check_and_update_unique_names(*args, **kwargs):
-        return True
-    
-    def check_if_trade_exist(*args, **kwargs):
-        return False  # Korrektur: False zurückgeben wenn kein Trade existiert
-
-logger = logging.getLogger(__name__)
-
-class ProfessionalSignalParser:
-    def __init__(self):
-        self.risk_limits = {
-            'max_leverage': 20,
-            'min_entry_price': 0.0001,
-            'max_position_size': 10000,
-            'min_risk_reward': 1.5
-        }
-        
-        self.parsing_stats = {
-            'total_signals': 0,
-            'successful_parses': 0,
-            'failed_parses': 0,
-            'last_parse_time': None,
-            'validation_errors': 0,
-            'order_errors': 0
-        }
-        
-        # Erweiterte Symbol-Erkennung
-        self.supported_symbols = [
-            'BTC', 'ETH', 'BNB', 'ADA', 'DOT', 'LINK', 'XRP', 'DOGE', 'SOL', 
-            'MATIC', 'LTC', 'BCH', 'XLM', 'ETC', 'TRX', 'AVAX', 'UNI', 'ATOM',
-            'FIL', 'ALGO', 'NEAR', 'FTM', 'SAND', 'MANA', 'ENJ', 'AAVE', 'MKR'
-        ]
-
-    def parse_signal(self, message: str) -> Tuple[bool, Optional[Dict]]:
-        """Parst Trading-Signale mit PROFESSIONELLER Logik"""
-        try:
-            self.parsing_stats['total_signals'] += 1
-            self.parsing_stats['last_parse_time'] = datetime.now()
-            
-            logger.info(f"📨 Processing signal (Length: {len(message)} chars)")
-            
-            # Pre-Cleaning des Messages
-            cleaned_message = self._pre_clean_message(message)
-            
-            # Extrahiere alle Daten mit erweiterter Logik
-            data = self._extract_all_data(cleaned_message)
-            
-            logger.info(f"🔍 Extracted data: {data}")
-            
-            if self._validate_data(data):
-                logger.info("✅ Signal validation passed")
-                return self._process_valid_signal(data)
-            else:
-                logger.error("❌ Signal validation failed")
-                self.parsing_stats['failed_parses'] += 1
-                return False, "Signal validation failed - check required fields"
-            
-        except Exception as e:
-            logger.error(f"❌ Critical error parsing signal: {e}")
-            self.parsing_stats['failed_parses'] += 1
-            return False, f"Parsing error: {str(e)}"
-
-    def _pre_clean_message(self, message: str) -> str:
-        """Bereinigt die Nachricht für besseres Parsing"""
-        # Entferne überflüssige Leerzeichen und normalisiere
-        message = re.sub(r'\s+', ' ', message.strip())
-        
-        # Ersetze verschiedene Bindestriche durch normale
-        message = message.replace('–', '-').replace('—', '-')
-        
-        # Normalisiere Preis-Trennzeichen
-        message = message.replace(',', '.')
-        
-        return message
-
-    def _extract_all_data(self, message: str) -> Dict[str, Any]:
-        """Extrahiert alle Daten mit PROFESSIONELLER Logik"""
-        data = {}
-        
-        try:
-            # Symbol (muss zuerst extrahiert werden)
-            data['symbol'] = self._extract_symbol(message)
-            if not data['symbol']:
-                return data
-                
-            # Entry Price mit Bereichs-Erkennung
-            data['entry_price'] = self._extract_entry_price(message)
-            
-            # Leverage
-            data['leverage'] = self._extract_leverage(message)
-            
-            # Direction
-            data['direction'] = self._extract_direction(message)
-            
-            # Stop Loss
-            data['stoploss'] = self._extract_stoploss(message, data.get('entry_price'), data.get('direction'))
-            
-            # Targets
-            data['targets'] = self._extract_targets(message, data.get('entry_price'), data.get('direction'))
-            
-            # Zusätzliche Metadaten
-            data['confidence'] = self._extract_confidence(message)
-            data['validity_hours'] = self._extract_validity(message)
-            data['risk_reward'] = self._calculate_risk_reward(data)
-            
-        except Exception as e:
-            logger.error(f"❌ Error in data extraction: {e}")
-            
-        return data
-
-    def _extract_symbol(self, message: str) -> Optional[str]:
-        """Extrahiert Symbol mit erweiterter Erkennung"""
-        try:
-            # Mehrere Symbol-Formate mit Priorität
-            patterns = [
-                r'#(\w+USDT)',  # #BTCUSDT
-                r'#(\w+)[^U]',  # #BTC (ohne USDT)
-                r'Symbol:\s*(\w+)',
-                r'Pair:\s*(\w+)',
-                r'(\w+/\w+)',   # BTC/USDT
-                r'(\w+USDT)',   # BTCUSDT
-                r'(\w+BTC)',    # ETHBTC
-                r'(\w+ETH)'     # LINKETH
-            ]
-            
-            for pattern in patterns:
-                matches = re.findall(pattern, message, re.IGNORECASE)
-                for match in matches:
-                    symbol = match.upper().strip()
-                    
-                    # Normalisiere Symbol
-                    symbol = symbol.replace('/', '')
-                    if not symbol.endswith('USDT') and not symbol.endswith('BTC') and not symbol.endswith('ETH'):
-                        # Prüfe ob es ein unterstütztes Symbol ist
-                        base_symbol = symbol
-                        if any(supported in base_symbol for supported in self.supported_symbols):
-                            symbol += 'USDT'
-                            logger.info(f"🔍 Symbol normalized: {symbol}")
-                            return symbol
-                    else:
-                        # Symbol hat bereits Pair-Endung
-                        logger.info(f"🔍 Symbol found: {symbol}")
-                        return symbol
-            
-            # Fallback: Suche nach bekannten Symbolen im Text
-            for supported_symbol in self.supported_symbols:
-                if supported_symbol in message.upper():
-                    symbol = f"{supported_symbol}USDT"
-                    logger.info(f"🔍 Symbol found via fallback: {symbol}")
-                    return symbol
-            
-            logger.error("❌ No valid symbol found")
-            return None
-            
-        except Exception as e:
-            logger.error(f"❌ Error extracting symbol: {e}")
-            return None
-
-    def _extract_entry_price(self, message: str) -> Optional[float]:
-        """Extrahiert Entry Price mit Bereichs-Erkennung (945-955) -> 950"""
-        try:
-            # PRIORITÄT 1: Explizite Entry Patterns mit Bereichen
-            range_patterns = [
-                r'Entry:\s*(\d+(?:\.\d+)?)\s*-\s*(\d+(?:\.\d+)?)',  # Entry: 945-955
-                r'Entry\s*[:\-]?\s*(\d+(?:\.\d+)?)\s*-\s*(\d+(?:\.\d+)?)',  # Entry 945-955
-                r'Buy:\s*(\d+(?:\.\d+)?)\s*-\s*(\d+(?:\.\d+)?)',    # Buy: 945-955
-                r'Price:\s*(\d+(?:\.\d+)?)\s*-\s*(\d+(?:\.\d+)?)',  # Price: 945-955
-            ]
-            
-            for pattern in range_patterns:
-                match = re.search(pattern, message, re.IGNORECASE)
-                if match and len(match.groups()) == 2:
-                    price1 = self._parse_price(match.group(1))
-                    price2 = self._parse_price(match.group(2))
-                    avg_price = (price1 + price2) / 2
-                    logger.info(f"🔍 Entry range found: {price1}-{price2} -> Average: {avg_price}")
-                    return avg_price
-            
-            # PRIORITÄT 2: Einzelne Entry Patterns
-            single_patterns = [
-                r'Entry:\s*(\d+(?:\.\d+)?)',      # Entry: 950
-                r'Entry\s*[:\-]?\s*(\d+(?:\.\d+)?)', # Entry 950
-                r'Price:\s*(\d+(?:\.\d+)?)',      # Price: 950
-                r'Buy:\s*(\d+(?:\.\d+)?)',        # Buy: 950
-                r'Sell:\s*(\d+(?:\.\d+)?)',       # Sell: 950
-                r'@\s*(\d+(?:\.\d+)?)',           # @950
-            ]
-            
-            for pattern in single_patterns:
-                match = re.search(pattern, message, re.IGNORECASE)
-                if match:
-                    price = self._parse_price(match.group(1))
-                    logger.info(f"🔍 Entry price found: {price}")
-                    return price
-            
-            # PRIORITÄT 3: Erste große Zahl nach Symbol
-            symbol_match = re.search(r'#(\w+)', message)
-            if symbol_match:
-                symbol_end = symbol_match.end()
-                # Suche Zahlen nach dem Symbol (nächste 200 Zeichen)
-                numbers_after_symbol = re.findall(r'(\d{3,}(?:\.\d+)?)', message[symbol_end:symbol_end+200])
-                if numbers_after_symbol:
-                    price = self._parse_price(numbers_after_symbol[0])
-                    logger.info(f"🔍 Entry price (symbol fallback): {price}")
-                    return price
-            
-            # PRIORITÄT 4: Allgemeine große Zahlen
-            all_large_numbers = re.findall(r'(\d{3,}(?:\.\d+)?)', message)
-            if all_large_numbers:
-                # Filtere unrealistische Preise
-                potential_prices = [float(num) for num in all_large_numbers if 0.1 < float(num) < 1000000]
-                if potential_prices:
-                    price = potential_prices[0]
-                    logger.info(f"🔍 Entry price (general fallback): {price}")
-                    return price
-            
-            logger.error("❌ No entry price found")
-            return None
-            
-        except Exception as e:
-            logger.error(f"❌ Error extracting entry price: {e}")
-            return None
-
-    def _extract_leverage(self, message: str) -> float:
-        """Extrahiert Leverage mit intelligenten Fallbacks"""
-        try:
-            patterns = [
-                r'Leverage:\s*([\d.]+)',
-                r'Leverage\s*[:\-]?\s*([\d.]+)',
-                r'Lev:\s*([\d.]+)',
-                r'([\d.]+)x',
-                r'([\d.]+)\s*Leverage',
-                r'Leverage\s*=\s*([\d.]+)'
-            ]
-            
-            for pattern in patterns:
-                matches = re.findall(pattern, message, re.IGNORECASE)
-                for match in matches:
-                    try:
-                        leverage = float(match)
-                        if 1 <= leverage <= self.risk_limits['max_leverage']:
-                            logger.info(f"🔍 Leverage found: {leverage}x")
-                            return leverage
-                    except ValueError:
-                        continue
-            
-            # Intelligenter Fallback basierend auf Signal-Art
-            if re.search(r'scalp|scalping', message, re.IGNORECASE):
-                leverage = 5.0
-            elif re.search(r'swing|position', message, re.IGNORECASE):
-                leverage = 3.0
-            else:
-                leverage = 3.0  # Standard-Leverage
-                
-            logger.info(f"🔍 Leverage (intelligent fallback): {leverage}x")
-            return leverage
-            
-        except Exception as e:
-            logger.error(f"❌ Error extracting leverage: {e}")
-            return 3.0  # Safe default
-
-    def _extract_direction(self, message: str) -> Optional[str]:
-        """Extrahiert Direction mit erweiterter Erkennung"""
-        try:
-            direction_indicators = {
-                'long': [
-                    r'\b(Long|BUY|L)\b',
-                    r'🟢', r'📈', r'🚀', r'⬆️', r'🔺',
-                    r'bullish', r'up', r'rise', r'increase',
-                    r'kaufen', r'kauf'  # Deutsch
-                ],
-                'short': [
-                    r'\b(Short|SELL|S)\b', 
-                    r'🔴', r'📉', r'🛬', r'⬇️', r'🔻',
-                    r'bearish', r'down', r'fall', r'decrease',
-                    r'verkaufen', r'verkauf'  # Deutsch
-                ]
-            }
-            
-            long_count = 0
-            short_count = 0
-            
-            for direction, patterns in direction_indicators.items():
-                for pattern in patterns:
-                    matches = re.findall(pattern, message, re.IGNORECASE)
-                    count = len(matches)
-                    if direction == 'long':
-                        long_count += count
-                    else:
-                        short_count += count
-            
-            if long_count > short_count:
-                direction = 'long'
-            elif short_count > long_count:
-                direction = 'short'
-            else:
-                # Fallback: Standard-Direction
-                direction = 'long'
-                logger.warning("⚠️ No clear direction found, using default: long")
-            
-            logger.info(f"🔍 Direction determined: {direction} (Long: {long_count}, Short: {short_count})")
-            return direction
-            
-        except Exception as e:
-            logger.error(f"❌ Error extracting direction: {e}")
-            return 'long'  # Safe default
-
-    def _extract_stoploss(self, message: str, entry_price: Optional[float], direction: Optional[str]) -> Optional[float]:
-        """Extrahiert Stop Loss mit intelligenten Fallbacks"""
-        try:
-            patterns = [
-                r'Stop[-\s]?Loss:\s*(\d+(?:\.\d+)?)',
-                r'SL:\s*(\d+(?:\.\d+)?)',
-                r'Stop:\s*(\d+(?:\.\d+)?)',
-                r'Stoploss:\s*(\d+(?:\.\d+)?)',
-                r'Risk:\s*(\d+(?:\.\d+)?)'
-            ]
-            
-            for pattern in patterns:
-                match = re.search(pattern, message, re.IGNORECASE)
-                if match:
-                    price = self._parse_price(match.group(1))
-                    logger.info(f"🔍 Stop loss found: {price}")
-                    return price
-            
-            # Intelligenter Fallback basierend auf Entry und Direction
-            if entry_price and direction:
-                if direction == 'long':
-                    stoploss = entry_price * 0.98  # 2% unter Entry
-                else:
-                    stoploss = entry_price * 1.02  # 2% über Entry
-                
-                logger.info(f"🔍 Stop loss (calculated): {stoploss}")
-                return stoploss
-            
-            logger.error("❌ No stop loss found and cannot calculate")
-            return None
-            
-        except Exception as e:
-            logger.error(f"❌ Error extracting stop loss: {e}")
-            return None
-
-    def _extract_targets(self, message: str, entry_price: Optional[float], direction: Optional[str]) -> List[float]:
-        """Extrahiert Targets mit PROFESSIONELLER Logik"""
-        try:
-            targets = []
-            
-            # METHODE 1: Explizite Target Patterns
-            target_patterns = [
-                r'Target\s*(\d):\s*(\d+(?:\.\d+)?)',  # Target 1: 970
-                r'TP?(\d):\s*(\d+(?:\.\d+)?)',        # TP1: 970
-                r'T\s*(\d)\s*:\s*(\d+(?:\.\d+)?)',    # T 1 : 970
-                r'Take\s*Profit\s*(\d):\s*(\d+(?:\.\d+)?)'  # Take Profit 1: 970
-            ]
-            
-            for pattern in target_patterns:
-                matches = re.findall(pattern, message, re.IGNORECASE)
-                if matches:
-                    for match_num, match_price in matches:
-                        try:
-                            target_num = int(match_num)
-                            price = self._parse_price(match_price)
-                            # Stelle sicher dass Targets in richtiger Reihenfolge
-                            while len(targets) < target_num:
-                                targets.append(0.0)
-                            targets[target_num-1] = price
-                        except (ValueError, IndexError):
-                            continue
-            
-            # METHODE 2: Zahlen die sinnvolle Targets sein könnten
-            if len(targets) < 4 and entry_price and direction:
-                all_numbers = re.findall(r'(\d{3,}(?:\.\d+)?)', message)
-                potential_targets = []
-                
-                for num_str in all_numbers:
-                    try:
-                        num = float(num_str)
-                        # Filtere basierend auf Direction und Entry
-                        if direction == 'long' and entry_price < num < entry_price * 1.2:
-                            potential_targets.append(num)
-                        elif direction == 'short' and entry_price > num > entry_price * 0.8:
-                            potential_targets.append(num)
-                    except ValueError:
-                        continue
-                
-                # Nehme die besten Kandidaten
-                potential_targets = sorted(set(potential_targets))
-                if direction == 'short':
-                    potential_targets.reverse()
-                
-                for target in potential_targets[:4]:
-                    if target not in targets:
-                        targets.append(target)
-            
-            # METHODE 3: Automatische Target-Berechnung
-            if len(targets) < 4 and entry_price and direction:
-                missing_targets = 4 - len(targets)
-                auto_targets = self._calculate_auto_targets(entry_price, direction, missing_targets)
-                targets.extend(auto_targets)
-            
-            # METHODE 4: Finale Sicherstellung von 4 Targets
-            if len(targets) < 4 and entry_price and direction:
-                self._ensure_four_targets(targets, entry_price, direction)
-            
-            # Finale Validierung und Sortierung
-            targets = self._validate_and_sort_targets(targets, entry_price, direction)
-            
-            logger.info(f"🎯 Final targets: {targets}")
-            return targets
-            
-        except Exception as e:
-            logger.error(f"❌ Error extracting targets: {e}")
-            # Ultimate Fallback
-            if entry_price and direction:
-                return self._calculate_fallback_targets(entry_price, direction)
-            return [100, 200, 300, 400]
-
-    def _calculate_auto_targets(self, entry_price: float, direction: str, count: int) -> List[float]:
-        """Berechnet automatische Targets basierend auf Markt-Logik"""
-        try:
-            targets = []
-            base_increment = 0.015  # 1.5% pro Target
-            
-            for i in range(1, count + 1):
-                if direction == 'long':
-                    target = entry_price * (1 + (i * base_increment))
-                else:
-                    target = entry_price * (1 - (i * base_increment))
-                targets.append(round(target, 2))
-            
-            return targets
-        except Exception as e:
-            logger.error(f"❌ Error calculating auto targets: {e}")
-            return []
-
-    def _ensure_four_targets(self, targets: List[float], entry_price: float, direction: str):
-        """Stellt sicher dass genau 4 Targets vorhanden sind"""
-        while len(targets) < 4:
-            if targets:
-                last_target = targets[-1]
-                if direction == 'long':
-                    new_target = last_target * 1.015  # +1.5%
-                else:
-                    new_target = last_target * 0.985  # -1.5%
-                targets.append(round(new_target, 2))
-            else:
-                # Fallback zu Standard-Targets
-                if direction == 'long':
-                    targets.extend([
-                        entry_price * 1.02,
-                        entry_price * 1.04,
-                        entry_price * 1.06,
-                        entry_price * 1.08
-                    ])
-                else:
-                    targets.extend([
-                        entry_price * 0.98,
-                        entry_price * 0.96,
-                        entry_price * 0.94,
-                        entry_price * 0.92
-                    ])
-                break
-
-    def _validate_and_sort_targets(self, targets: List[float], entry_price: Optional[float], direction: Optional[str]) -> List[float]:
-        """Validiert und sortiert Targets"""
-        if not targets:
-            return targets
-            
-        # Entferne Duplikate und Null-Werte
-        targets = list(set([t for t in targets if t > 0]))
-        
-        # Sortiere basierend auf Direction
-        if direction == 'long':
-            targets.sort()
-        elif direction == 'short':
-            targets.sort(reverse=True)
-        else:
-            targets.sort()
-        
-        # Stelle sicher dass Targets sinnvoll sind
-        if entry_price and direction:
-            if direction == 'long':
-                targets = [t for t in targets if t > entry_price]
-            else:
-                targets = [t for t in targets if t < entry_price]
-        
-        # Begrenze auf 4 Targets
-        return targets[:4]
-
-    def _calculate_fallback_targets(self, entry_price: float, direction: str) -> List[float]:
-        """Berechnet Fallback-Targets"""
-        if direction == 'long':
-            return [
-                round(entry_price * 1.02, 2),
-                round(entry_price * 1.04, 2),
-                round(entry_price * 1.06, 2),
-                round(entry_price * 1.08, 2)
-            ]
-        else:
-            return [
-                round(entry_price * 0.98, 2),
-                round(entry_price * 0.96, 2),
-                round(entry_price * 0.94, 2),
-                round(entry_price * 0.92, 2)
-            ]
-
-    def _extract_confidence(self, message: str) -> float:
-        """Extrahiert Confidence Level aus dem Signal"""
-        try:
-            confidence_patterns = [
-                r'Confidence:\s*(\d+)%',
-                r'Conf:\s*(\d+)%',
-                r'(\d+)%\s*confidence',
-                r'Win Rate:\s*(\d+)%'
-            ]
-            
-            for pattern in confidence_patterns:
-                match = re.search(pattern, message, re.IGNORECASE)
-                if match:
-                    confidence = float(match.group(1))
-                    return min(confidence, 100)  # Max 100%
-            
-            return 75.0  # Default confidence
-        except:
-            return 75.0
-
-    def _extract_validity(self, message: str) -> int:
-        """Extrahiert Gültigkeitsdauer des Signals"""
-        try:
-            validity_patterns = [
-                r'validity:\s*(\d+)\s*hours',
-                r'gültig.*?(\d+)\s*stunden',
-                r'expires.*?(\d+)\s*h',
-                r'timeframe:\s*(\d+)\s*h'
-            ]
-            
-            for pattern in validity_patterns:
-                match = re.search(pattern, message, re.IGNORECASE)
-                if match:
-                    return int(match.group(1))
-            
-            return 24  # Default 24 hours
-        except:
-            return 24
-
-    def _calculate_risk_reward(self, data: Dict) -> float:
-        """Berechnet Risk/Reward Ratio"""
-        try:
-            if not all(k in data for k in ['entry_price', 'stoploss', 'targets']):
-                return 1.0
-                
-            entry = data['entry_price']
-            stop = data['stoploss']
-            first_target = data['targets'][0] if data['targets'] else entry
-            
-            if data.get('direction') == 'long':
-                risk = entry - stop
-                reward = first_target - entry
-            else:
-                risk = stop - entry
-                reward = entry - first_target
-                
-            if risk > 0:
-                return round(reward / risk, 2)
-            return 1.0
-        except:
-            return 1.0
-
-    def _parse_price(self, price_str: str) -> float:
-        """Parset Preis-Strings robust"""
-        try:
-            # Entferne alle nicht-numerischen Zeichen außer Punkten
-            cleaned = re.sub(r'[^\d.]', '', price_str)
-            if not cleaned:
-                raise ValueError("Empty price string")
-            return float(cleaned)
-        except ValueError as e:
-            logger.error(f"❌ Invalid price format: {price_str} -> {e}")
-            raise ValueError(f"Invalid price format: {price_str}")
-
-    def _validate_data(self, data: Dict) -> bool:
-        """Validiert die extrahierten Daten PROFESSIONELL"""
-        required_fields = ['symbol', 'entry_price', 'direction', 'stoploss', 'targets']
-        
-        # Prüfe erforderliche Felder
-        missing_fields = [field for field in required_fields if not data.get(field)]
-        if missing_fields:
-            logger.error(f"❌ Missing required fields: {missing_fields}")
-            logger.error(f"❌ Current data: {data}")
-            self.parsing_stats['validation_errors'] += 1
-            return False
-        
-        # Mindestanzahl Targets
-        if len(data['targets']) < 2:
-            logger.error(f"❌ Insufficient targets: {len(data['targets'])}")
-            self.parsing_stats['validation_errors'] += 1
-            return False
-        
-        # Grundlegende Validierungen
-        if data['direction'] not in ['long', 'short']:
-            logger.error(f"❌ Invalid direction: {data['direction']}")
-            self.parsing_stats['validation_errors'] += 1
-            return False
-        
-        if data['entry_price'] <= 0:
-            logger.error(f"❌ Invalid entry price: {data['entry_price']}")
-            self.parsing_stats['validation_errors'] += 1
-            return False
-        
-        # Risk/Reward Validierung
-        if data.get('risk_reward', 1.0) < self.risk_limits['min_risk_reward']:
-            logger.warning(f"⚠️ Low risk/reward ratio: {data.get('risk_reward')}")
-        
-        logger.info("✅ All validations passed")
-        return True
-
-    def _process_valid_signal(self, data: Dict) -> Tuple[bool, Optional[Dict]]:
-        """Verarbeitet einen validen Trading-Signal"""
-        try:
-            # Prüfe auf existierenden Trade (KORREKTUR: should_return_false_when_no_trade_exists)
-            if check_if_trade_exist(data['symbol']):
-                return False, f"Active trade already exists for {data['symbol']}"
-            
-            # Erstelle Order
-            return self._create_order(data)
-            
-        except Exception as e:
-            logger.error(f"❌ Error processing valid signal: {e}")
-            self.parsing_stats['order_errors'] += 1
-            return False, str(e)
-
-    def _create_order(self, data: Dict) -> Tuple[bool, Optional[Dict]]:
-        """Erstellt eine Order basierend auf den Signal-Daten"""
-        try:
-            # Berechne Positionsgröße
-            quantity, risk_amount = binance_api.calculate_position_size(data['entry_price'])
-            
-            # Bestimme Order Side
-            side = 'buy' if data['direction'] == 'long' else 'sell'
-            
-            logger.info(f"🎯 Creating {side.upper()} order for {data['symbol']}")
-            
-            # Erstelle Order
-            order = binance_api.create_spot_order(
-                symbol=data['symbol'],
-                side=side,
-                quantity=quantity,
-                price=data['entry_price']
-            )
-            
-            # Bereite Trade-Daten vor
-            trade_data = {
-                'symbol': data['symbol'],
-                'entry_price': data['entry_price'],
-                'direction': data['direction'],
-                'quantity': quantity,
-                'stoploss': data['stoploss'],
-                'targets': data['targets'],
-                'leverage': data['leverage'],
-                'order_id': order['id'],
-                'risk_amount': risk_amount,
-                'order_timestamp': datetime.now().isoformat(),
-                'confidence': data.get('confidence', 75.0),
-                'risk_reward': data.get('risk_reward', 1.0)
-            }
-            
-            # Speichere Trade in Datenbank
-            success = self._save_trade_to_db(trade_data)
-            
-            if success:
-                self.parsing_stats['successful_parses'] += 1
-                
-                logger.info(f"""
-✅ SUCCESSFULLY EXECUTED TRADE:
-├ 📊 Symbol: {trade_data['symbol']}
-├ 📈 Direction: {trade_data['direction'].upper()}
-├ 💰 Entry: {trade_data['entry_price']:,.2f}
-├ ⚖️ Quantity: {trade_data['quantity']:.6f}
-├ 🏦 Leverage: {trade_data['leverage']}x
-├ ⛔ Stop Loss: {trade_data['stoploss']:,.2f}
-├ 🎯 Targets: {', '.join(f'{t:,.2f}' for t in trade_data['targets'])}
-├ 📊 Risk/Reward: {trade_data['risk_reward']}:1
-├ 🔮 Confidence: {trade_data['confidence']}%
-└ 🔢 Order ID: {trade_data['order_id']}
-""")
-                
-                return True, trade_data
-            else:
-                logger.error(f"❌ Failed to save trade to database: {data['symbol']}")
-                self.parsing_stats['order_errors'] += 1
-                return False, "Database save failed"
-            
-        except Exception as e:
-            logger.error(f"❌ Error creating order: {e}")
-            self.parsing_stats['order_errors'] += 1
-            return False, str(e)
-
-    def _save_trade_to_db(self, trade_data: Dict) -> bool:
-        """Speichert Trade in Datenbank - ROBUSTE VERSION"""
-        try:
-            # Verwende db_manager direkt für mehr Stabilität
-            success =new_trade_db(
-                date=str(datetime.now().strftime("%d/%m/%Y %H:%M:%S")),
-                symbol=trade_data['symbol'],
-                leverage=float(trade_data['leverage']),
-                price=float(trade_data['entry_price']),
-                positionSide=trade_data['direction'],
-                qty=float(trade_data['quantity']),
-                stoploss=float(trade_data['stoploss']),
-                tk1=float(trade_data['targets'][0]),
-                tk2=float(trade_data['targets'][1]),
-                tk3=float(trade_data['targets'][2]),
-                tk4=float(trade_data['targets'][3]),
-                ordersID=json.dumps([trade_data['order_id']]),
-                risk_amount=float(trade_data.get('risk_amount', 0)),
-                confidence=float(trade_data.get('confidence', 75.0)),
-                risk_reward=float(trade_data.get('risk_reward', 1.0))
-            )
-            
-            if success:
-                check_and_update_unique_names("SymbolsTraded.txt", trade_data['symbol'])
-                logger.info(f"💾 Trade saved to database: {trade_data['symbol']}")
-            else:
-                logger.error(f"❌ Database save failed for: {trade_data['symbol']}")
-            
-            return success
-            
-        except Exception as e:
-            logger.error(f"❌ Error saving trade to database: {e}")
-            return False
-    def _emergency_trade_save(self, trade_data: Dict) -> bool:
-        """Notfall-Speicherung wenn normale Datenbank fehlschlägt"""
-        try:
-            # Erstelle Backup in separater Datei
-            backup_file = "emergency_trades.json"
-            emergency_data = {
-                'symbol': trade_data['symbol'],
-                'entry_price': trade_data['entry_price'],
-                'direction': trade_data['direction'],
-                'quantity': trade_data['quantity'],
-                'targets': trade_data['targets'],
-                'stoploss': trade_data['stoploss'],
-                'leverage': trade_data.get('leverage', 1),
-                'order_id': trade_data['order_id'],
-                'timestamp': datetime.now().isoformat()
-            }
-            
-            # Lade existierende Daten
-            existing_data = []
-            if os.path.exists(backup_file):
-                try:
-                    with open(backup_file, 'r') as f:
-                        existing_data = json.load(f)
-                except:
-                    existing_data = []
-            
-            # Füge neuen Trade hinzu
-            existing_data.append(emergency_data)
-            
-            # Speichere Backup
-            with open(backup_file, 'w') as f:
-                json.dump(existing_data, f, indent=2)
-            
-            logger.warning(f"⚠️ Emergency trade saved to file: {trade_data['symbol']}")
-            return True
-            
-        except Exception as e:
-            logger.error(f"❌ Emergency save also failed: {e}")
-            return False
-    def get_parsing_stats(self) -> Dict[str, Any]:
-        """Gibt Parsing-Statistiken zurück"""
-        success_rate = (
-            (self.parsing_stats['successful_parses'] / self.parsing_stats['total_signals'] * 100)
-            if self.parsing_stats['total_signals'] > 0 else 0
-        )
-        
-        return {
-            **self.parsing_stats,
-            'success_rate_percent': round(success_rate, 2),
-            'supported_symbols_count': len(self.supported_symbols)
-        }
-
-# Globale Instanz
-signal_parser = ProfessionalSignalParser()
\ No newline at end of file
+import atexit
+import re
+import json
+import logging
+import queue
+import sys
+import threading
+import time
+from datetime import datetime
+from typing import Dict, Optional, Tuple, List, Any
+from decimal import Decimal, ROUND_HALF_UP
+from enhanced_binance_api import binance_api
+import os
+# orjson (Rust-Encoder, ~5-10x schneller als stdlib json) - optional
+try:
+    import orjson
+except ImportError:
+    orjson = None
+# Database imports
+try:
+    from database import new_trade_db_row, new_trades_db_batch, check_if_trade_exist
+except ImportError as e:
+    logging.error(f"Database import error: {e}")
+    # Fallback functions for testing
+    def new_trade_db_row(*args, **kwargs):
+        logging.warning("new_trade_db_row not available - running in test mode")
+        return True
+
+    def new_trades_db_batch(rows):
+        logging.warning("new_trades_db_batch not available - running in test mode")
+        return {row[1].upper(): True for row in rows}
+
+    def check_if_trade_exist(*args, **kwargs):
+        return False  # Korrektur: False zurückgeben wenn kein Trade existiert
+
+logger = logging.getLogger(__name__)
+
+# Unterstützte Basis-Symbole: frozenset für Exact-Match, eine kompilierte
+# Alternation für den Substring-Fallback (1 Scan statt 27)
+_SUPPORTED_SYMBOLS = (
+    'BTC', 'ETH', 'BNB', 'ADA', 'DOT', 'LINK', 'XRP', 'DOGE', 'SOL',
+    'MATIC', 'LTC', 'BCH', 'XLM', 'ETC', 'TRX', 'AVAX', 'UNI', 'ATOM',
+    'FIL', 'ALGO', 'NEAR', 'FTM', 'SAND', 'MANA', 'ENJ', 'AAVE', 'MKR'
+)
+_SUPPORTED_SYMBOLS_SET = frozenset(_SUPPORTED_SYMBOLS)
+_SYMBOLS_FALLBACK_RE = re.compile(
+    '|'.join(sorted(_SUPPORTED_SYMBOLS, key=len, reverse=True))
+)
+
+# Vorkompilierte Regex-Patterns (einmalig auf Modul-Ebene, statt pro Aufruf)
+_WS_RE = re.compile(r'\s+')
+_DASH_TRANS = str.maketrans({'–': '-', '—': '-'})
+# Zeichen, die eine Bereinigung der Nachricht nötig machen
+_DIRTY_MARKERS = ('–', '—', ',', '  ', '\t', '\n', '\r')
+# Translate-Tabelle: entfernt alles außer Ziffern und Punkt (C-Level, ohne Regex)
+_PRICE_KEEP_TRANS = str.maketrans('', '', ''.join(
+    c for c in map(chr, range(128)) if not c.isdigit() and c != '.'
+))
+_LARGE_NUM_RE = re.compile(r'\d{3,}(?:\.\d+)?')
+_HASH_SYMBOL_RE = re.compile(r'#(\w+)')
+
+_SYMBOL_PATTERNS = tuple(re.compile(p, re.IGNORECASE) for p in (
+    r'#(\w+USDT)',  # #BTCUSDT
+    r'#(\w+)[^U]',  # #BTC (ohne USDT)
+    r'Symbol:\s*(\w+)',
+    r'Pair:\s*(\w+)',
+    r'(\w+/\w+)',   # BTC/USDT
+    r'(\w+USDT)',   # BTCUSDT
+    r'(\w+BTC)',    # ETHBTC
+    r'(\w+ETH)'     # LINKETH
+))
+
+# Die folgenden Patterns werden gegen eine EINMAL pro Signal erzeugte
+# lowercase-Kopie der Nachricht gematcht - re.IGNORECASE (Case-Folding pro
+# Zeichen in der Engine) entfaellt dadurch komplett.
+_ENTRY_RANGE_PATTERNS = tuple(re.compile(p) for p in (
+    r'entry:\s*(\d+(?:\.\d+)?)\s*-\s*(\d+(?:\.\d+)?)',  # entry: 945-955
+    r'entry\s*[:\-]?\s*(\d+(?:\.\d+)?)\s*-\s*(\d+(?:\.\d+)?)',  # entry 945-955
+    r'buy:\s*(\d+(?:\.\d+)?)\s*-\s*(\d+(?:\.\d+)?)',    # buy: 945-955
+    r'price:\s*(\d+(?:\.\d+)?)\s*-\s*(\d+(?:\.\d+)?)',  # price: 945-955
+))
+
+_ENTRY_SINGLE_PATTERNS = tuple(re.compile(p) for p in (
+    r'entry:\s*(\d+(?:\.\d+)?)',      # entry: 950
+    r'entry\s*[:\-]?\s*(\d+(?:\.\d+)?)', # entry 950
+    r'price:\s*(\d+(?:\.\d+)?)',      # price: 950
+    r'buy:\s*(\d+(?:\.\d+)?)',        # buy: 950
+    r'sell:\s*(\d+(?:\.\d+)?)',       # sell: 950
+    r'@\s*(\d+(?:\.\d+)?)',           # @950
+))
+
+_LEVERAGE_PATTERNS = tuple(re.compile(p) for p in (
+    r'leverage:\s*([\d.]+)',
+    r'leverage\s*[:\-]?\s*([\d.]+)',
+    r'lev:\s*([\d.]+)',
+    r'([\d.]+)x',
+    r'([\d.]+)\s*leverage',
+    r'leverage\s*=\s*([\d.]+)'
+))
+
+# Master-Pattern: Symbol, Entry (Bereich/einzeln) und Leverage in EINEM Scan.
+# Die Reihenfolge der Alternativen ist wichtig: Bereich vor Einzelwert.
+_MASTER_PATTERN = re.compile(
+    r'(?P<symbol>#\w+USDT)'
+    r'|Entry\s*[:\-]?\s*(?P<entry_lo>\d+(?:\.\d+)?)\s*-\s*(?P<entry_hi>\d+(?:\.\d+)?)'
+    r'|Entry\s*[:\-]?\s*(?P<entry>\d+(?:\.\d+)?)'
+    r'|Leverage\s*[:=\-]?\s*(?P<lev>[\d.]+)',
+    re.IGNORECASE
+)
+
+# Notfall-Backup als NDJSON (eine Zeile pro Trade, append-only)
+_EMERGENCY_BACKUP_FILE = "emergency_trades.json"
+
+# Liste der jemals gehandelten Symbole (nur noch periodisch geschrieben)
+_TRADED_SYMBOLS_FILE = "SymbolsTraded.txt"
+
+# strftime-Cache mit Sekunden-Auflösung: bei Batch-Flushes wird derselbe
+# Datums-String nicht mehrfach formatiert
+_DATE_CACHE = [0, '']
+
+def _now_date_str() -> str:
+    now = int(time.time())
+    if now != _DATE_CACHE[0]:
+        _DATE_CACHE[0] = now
+        _DATE_CACHE[1] = time.strftime("%d/%m/%Y %H:%M:%S")
+    return _DATE_CACHE[1]
+
+def _as_float(value) -> float:
+    """float()-Cast nur wenn der Wert nicht schon ein float ist"""
+    return value if type(value) is float else float(value)
+
+def _json_dumps(obj) -> str:
+    """JSON-Encode über orjson falls verfügbar, sonst stdlib json"""
+    if orjson is not None:
+        return orjson.dumps(obj).decode()
+    return json.dumps(obj)
+
+# Billiger Vorfilter: Chat-/Spam-Nachrichten ohne Signal-Merkmale werden
+# mit EINEM Scan abgewiesen, bevor die komplette Extraktion anläuft.
+# Bewusst ein SUPERSET aller Extraktor-Trigger (Symbol-/Pair-Header,
+# @-Entries, SL-/Stop-Varianten, T-n-Targets, nackte Symbol-Nennungen) —
+# was die Extraktion akzeptieren würde, darf hier nie abgewiesen werden
+_SIGNAL_GATE = re.compile(
+    r'(?i)#\w+|symbol\s*:|pair\s*:|usdt'
+    r'|entry\s*[:\-]|price\s*:|@\s*\d|buy|sell'
+    r'|target\s*\d|t\s*\d\s*:|tp\s*\d|take\s*profit'
+    r'|stop|sl\s*:|risk\s*:'
+    r'|leverage|lev\s*:'
+    r'|' + _SYMBOLS_FALLBACK_RE.pattern
+)
+
+_SCALP_RE = re.compile(r'scalp|scalping')
+_SWING_RE = re.compile(r'swing|position')
+
+# Direction-Indikatoren: Wörter als eine Alternation, Emojis als fixe
+# Substrings über str.count (C-Level-Suche statt Unicode-Regex)
+_LONG_WORDS_RE = re.compile(
+    r'\b(?:long|buy|l)\b'
+    r'|bullish|up|rise|increase'
+    r'|kaufen|kauf'  # Deutsch
+)
+_SHORT_WORDS_RE = re.compile(
+    r'\b(?:short|sell|s)\b'
+    r'|bearish|down|fall|decrease'
+    r'|verkaufen|verkauf'  # Deutsch
+)
+_LONG_EMOJIS = ('🟢', '📈', '🚀', '⬆️', '🔺')
+_SHORT_EMOJIS = ('🔴', '📉', '🛬', '⬇️', '🔻')
+
+_STOPLOSS_PATTERNS = tuple(re.compile(p) for p in (
+    r'stop[-\s]?loss:\s*(\d+(?:\.\d+)?)',
+    r'sl:\s*(\d+(?:\.\d+)?)',
+    r'stop:\s*(\d+(?:\.\d+)?)',
+    r'stoploss:\s*(\d+(?:\.\d+)?)',
+    r'risk:\s*(\d+(?:\.\d+)?)'
+))
+
+_TARGET_PATTERNS = tuple(re.compile(p) for p in (
+    r'target\s*(\d):\s*(\d+(?:\.\d+)?)',  # target 1: 970
+    r'tp?(\d):\s*(\d+(?:\.\d+)?)',        # tp1: 970
+    r't\s*(\d)\s*:\s*(\d+(?:\.\d+)?)',    # t 1 : 970
+    r'take\s*profit\s*(\d):\s*(\d+(?:\.\d+)?)'  # take profit 1: 970
+))
+
+_CONFIDENCE_PATTERNS = tuple(re.compile(p) for p in (
+    r'confidence:\s*(\d+)%',
+    r'conf:\s*(\d+)%',
+    r'(\d+)%\s*confidence',
+    r'win rate:\s*(\d+)%'
+))
+
+_VALIDITY_PATTERNS = tuple(re.compile(p) for p in (
+    r'validity:\s*(\d+)\s*hours',
+    r'gültig.*?(\d+)\s*stunden',
+    r'expires.*?(\d+)\s*h',
+    r'timeframe:\s*(\d+)\s*h'
+))
+
+class ProfessionalSignalParser:
+    # __slots__: Attribut-Zugriff als Offset-Load statt __dict__-Hash,
+    # kompakteres Instanz-Layout
+    __slots__ = (
+        'risk_limits', 'supported_symbols',
+        'total_signals', 'successful_parses', 'failed_parses',
+        'last_parse_time', 'validation_errors', 'order_errors',
+        '_write_queue', '_pending_db_symbols', '_pending_lock',
+        '_writer_thread', '_trade_exist_cache', '_trade_exist_ttl',
+        '_traded_symbols', '_symbols_dirty',
+        '_stats_cache', '_stats_cache_key',
+    )
+
+    def __init__(self):
+        self.risk_limits = {
+            'max_leverage': 20,
+            'min_entry_price': 0.0001,
+            'max_position_size': 10000,
+            'min_risk_reward': 1.5
+        }
+
+        # Parsing-Statistiken als skalare Attribute statt Dict
+        # (Zähler-Inkrement ohne String-Hash pro Signal).
+        # Vertrag: NUR der Signal-Thread inkrementiert diese Zähler -
+        # der Writer-Thread und Stats-Poller lesen höchstens. Dadurch
+        # kommen die Inkremente ohne Lock aus.
+        self.total_signals = 0
+        self.successful_parses = 0
+        self.failed_parses = 0
+        self.last_parse_time = None
+        self.validation_errors = 0
+        self.order_errors = 0
+
+        # Gecachte Statistik-Sicht (wird nur bei Zähler-Änderung neu gebaut)
+        self._stats_cache = None
+        self._stats_cache_key = None
+
+        # Asynchrone Trade-Persistenz: Queue + Hintergrund-Writer
+        # (Signal-Parsing wartet nicht mehr auf den DB-Roundtrip)
+        self._write_queue = queue.Queue()
+        self._pending_db_symbols = set()
+        self._pending_lock = threading.Lock()
+
+        # Kurzlebiger Cache für die Duplikat-Prüfung (Rebroadcast-Stürme
+        # in Telegram-Channels sollen nicht jedes Mal die DB treffen)
+        self._trade_exist_cache = {}
+        self._trade_exist_ttl = 5.0  # Sekunden
+
+        # Gehandelte Symbole im Speicher halten; die Datei wird nur noch
+        # vom Writer-Thread geschrieben, wenn sich etwas geändert hat
+        self._traded_symbols = self._load_traded_symbols()
+        self._symbols_dirty = False
+        self._writer_thread = threading.Thread(
+            target=self._drain_write_queue, daemon=True, name='TradeDBWriter'
+        )
+        self._writer_thread.start()
+
+        # Erweiterte Symbol-Erkennung
+        self.supported_symbols = list(_SUPPORTED_SYMBOLS)
+
+    def parse_signal(self, message: str) -> Tuple[bool, Optional[Dict]]:
+        """Parst Trading-Signale mit PROFESSIONELLER Logik"""
+        try:
+            self.total_signals += 1
+            # time.time()-Float statt datetime-Objekt; ISO-Formatierung
+            # passiert erst beim Auslesen der Statistiken
+            self.last_parse_time = time.time()
+
+            # Fast-Reject: offensichtliche Nicht-Signale gar nicht erst parsen
+            if not _SIGNAL_GATE.search(message):
+                self.failed_parses += 1
+                return False, "not a signal"
+
+            logger.info("📨 Processing signal (Length: %s chars)", len(message))
+            
+            # Pre-Cleaning des Messages
+            cleaned_message = self._pre_clean_message(message)
+            
+            # Extrahiere alle Daten mit erweiterter Logik
+            data = self._extract_all_data(cleaned_message)
+            
+            logger.info("🔍 Extracted data: %s", data)
+            
+            if self._validate_data(data):
+                logger.info("✅ Signal validation passed")
+                return self._process_valid_signal(data)
+            else:
+                logger.error("❌ Signal validation failed")
+                self.failed_parses += 1
+                return False, "Signal validation failed - check required fields"
+            
+        except Exception as e:
+            logger.error("❌ Critical error parsing signal: %s", e)
+            self.failed_parses += 1
+            return False, f"Parsing error: {str(e)}"
+
+    def _pre_clean_message(self, message: str) -> str:
+        """Bereinigt die Nachricht für besseres Parsing"""
+        # Fast Path: templated Signale sind meist bereits sauber -
+        # dann keinerlei String-Neuaufbau
+        if message == message.strip() and not any(m in message for m in _DIRTY_MARKERS):
+            return message
+
+        # Entferne überflüssige Leerzeichen und normalisiere
+        message = _WS_RE.sub(' ', message.strip())
+
+        # Ersetze verschiedene Bindestriche durch normale (ein C-Level-Pass)
+        if '–' in message or '—' in message:
+            message = message.translate(_DASH_TRANS)
+
+        # Normalisiere Preis-Trennzeichen
+        if ',' in message:
+            message = message.replace(',', '.')
+
+        return message
+
+    def _extract_all_data(self, message: str) -> Dict[str, Any]:
+        """Extrahiert alle Daten mit PROFESSIONELLER Logik"""
+        data = {}
+
+        try:
+            # Lowercase-Kopie EINMAL erzeugen - alle case-insensitiven
+            # Extraktoren matchen dagegen ohne re.IGNORECASE
+            message_lower = message.lower()
+
+            # Schneller Single-Pass: Symbol, Entry und Leverage in einem Scan
+            fast = self._master_scan(message)
+
+            # Symbol (muss zuerst extrahiert werden; braucht das Original
+            # wegen der Großschreibung)
+            data['symbol'] = fast.get('symbol') or self._extract_symbol(message)
+            if not data['symbol']:
+                return data
+
+            # Entry Price mit Bereichs-Erkennung (Bereich hat Vorrang)
+            if 'entry_range' in fast:
+                data['entry_price'] = fast['entry_range']
+            elif 'entry' in fast:
+                data['entry_price'] = fast['entry']
+            else:
+                data['entry_price'] = self._extract_entry_price(message_lower)
+
+            # Leverage
+            data['leverage'] = (
+                fast['leverage'] if 'leverage' in fast
+                else self._extract_leverage(message_lower)
+            )
+
+            # Direction
+            data['direction'] = self._extract_direction(message_lower)
+
+            # Stop Loss
+            data['stoploss'] = self._extract_stoploss(message_lower, data.get('entry_price'), data.get('direction'))
+
+            # Targets
+            data['targets'] = self._extract_targets(message_lower, data.get('entry_price'), data.get('direction'))
+
+            # Zusätzliche Metadaten
+            data['confidence'] = self._extract_confidence(message_lower)
+            data['validity_hours'] = self._extract_validity(message_lower)
+            targets = data['targets']
+            data['risk_reward'] = self._calculate_risk_reward(
+                data['entry_price'], data['stoploss'],
+                targets[0] if targets else data['entry_price'],
+                data['direction']
+            )
+            
+        except Exception as e:
+            logger.error("❌ Error in data extraction: %s", e)
+            
+        return data
+
+    def _master_scan(self, message: str) -> Dict[str, Any]:
+        """Ein einzelner finditer-Pass über die Nachricht für die häufigsten Felder.
+
+        Liefert nur eindeutig erkannte Werte; fehlende Felder werden vom
+        jeweiligen Einzel-Extractor als Fallback behandelt.
+        """
+        fast: Dict[str, Any] = {}
+        try:
+            for m in _MASTER_PATTERN.finditer(message):
+                group = m.lastgroup
+                if group == 'symbol':
+                    if 'symbol' not in fast:
+                        symbol = sys.intern(m.group('symbol').lstrip('#').upper())
+                        logger.info("🔍 Symbol found: %s", symbol)
+                        fast['symbol'] = symbol
+                elif group == 'entry_hi':
+                    if 'entry_range' not in fast:
+                        price1 = float(m.group('entry_lo'))
+                        price2 = float(m.group('entry_hi'))
+                        avg_price = (price1 + price2) / 2
+                        logger.info("🔍 Entry range found: %s-%s -> Average: %s", price1, price2, avg_price)
+                        fast['entry_range'] = avg_price
+                elif group == 'entry':
+                    if 'entry' not in fast:
+                        price = float(m.group('entry'))
+                        logger.info("🔍 Entry price found: %s", price)
+                        fast['entry'] = price
+                elif group == 'lev':
+                    if 'leverage' not in fast:
+                        try:
+                            leverage = float(m.group('lev'))
+                        except ValueError:
+                            continue
+                        if 1 <= leverage <= self.risk_limits['max_leverage']:
+                            logger.info("🔍 Leverage found: %sx", leverage)
+                            fast['leverage'] = leverage
+        except Exception as e:
+            logger.error("❌ Error in master scan: %s", e)
+        return fast
+
+    def _extract_symbol(self, message: str) -> Optional[str]:
+        """Extrahiert Symbol mit erweiterter Erkennung"""
+        try:
+            # Mehrere Symbol-Formate mit Priorität (vorkompiliert)
+            for pattern in _SYMBOL_PATTERNS:
+                matches = pattern.findall(message)
+                for match in matches:
+                    symbol = match.upper().strip()
+                    
+                    # Normalisiere Symbol
+                    symbol = symbol.replace('/', '')
+                    if not symbol.endswith('USDT') and not symbol.endswith('BTC') and not symbol.endswith('ETH'):
+                        # Prüfe ob es ein unterstütztes Symbol ist
+                        base_symbol = symbol
+                        if base_symbol in _SUPPORTED_SYMBOLS_SET or _SYMBOLS_FALLBACK_RE.search(base_symbol):
+                            symbol += 'USDT'
+                            logger.info("🔍 Symbol normalized: %s", symbol)
+                            return sys.intern(symbol)
+                    else:
+                        # Symbol hat bereits Pair-Endung
+                        logger.info("🔍 Symbol found: %s", symbol)
+                        return sys.intern(symbol)
+            
+            # Fallback: Suche nach bekannten Symbolen im Text (ein Scan)
+            fallback_match = _SYMBOLS_FALLBACK_RE.search(message.upper())
+            if fallback_match:
+                symbol = sys.intern(f"{fallback_match.group()}USDT")
+                logger.info("🔍 Symbol found via fallback: %s", symbol)
+                return symbol
+            
+            logger.error("❌ No valid symbol found")
+            return None
+            
+        except Exception as e:
+            logger.error("❌ Error extracting symbol: %s", e)
+            return None
+
+    def _extract_entry_price(self, message: str) -> Optional[float]:
+        """Extrahiert Entry Price mit Bereichs-Erkennung (945-955) -> 950"""
+        try:
+            # PRIORITÄT 1: Explizite Entry Patterns mit Bereichen
+            for pattern in _ENTRY_RANGE_PATTERNS:
+                match = pattern.search(message)
+                if match and len(match.groups()) == 2:
+                    price1 = self._parse_price(match.group(1))
+                    price2 = self._parse_price(match.group(2))
+                    avg_price = (price1 + price2) / 2
+                    logger.info("🔍 Entry range found: %s-%s -> Average: %s", price1, price2, avg_price)
+                    return avg_price
+            
+            # PRIORITÄT 2: Einzelne Entry Patterns
+            for pattern in _ENTRY_SINGLE_PATTERNS:
+                match = pattern.search(message)
+                if match:
+                    price = self._parse_price(match.group(1))
+                    logger.info("🔍 Entry price found: %s", price)
+                    return price
+            
+            # PRIORITÄT 3: Erste große Zahl nach Symbol
+            symbol_match = _HASH_SYMBOL_RE.search(message)
+            if symbol_match:
+                symbol_end = symbol_match.end()
+                # Suche Zahlen nach dem Symbol (nächste 200 Zeichen), lazy
+                number_match = _LARGE_NUM_RE.search(message, symbol_end, symbol_end + 200)
+                if number_match:
+                    price = float(number_match.group())
+                    logger.info("🔍 Entry price (symbol fallback): %s", price)
+                    return price
+
+            # PRIORITÄT 4: Allgemeine große Zahlen (erster realistischer Treffer,
+            # ohne Zwischenliste)
+            price = next(
+                (p for p in (float(m.group()) for m in _LARGE_NUM_RE.finditer(message))
+                 if 0.1 < p < 1000000),
+                None
+            )
+            if price is not None:
+                logger.info("🔍 Entry price (general fallback): %s", price)
+                return price
+            
+            logger.error("❌ No entry price found")
+            return None
+            
+        except Exception as e:
+            logger.error("❌ Error extracting entry price: %s", e)
+            return None
+
+    def _extract_leverage(self, message: str) -> float:
+        """Extrahiert Leverage mit intelligenten Fallbacks"""
+        try:
+            for pattern in _LEVERAGE_PATTERNS:
+                matches = pattern.findall(message)
+                for match in matches:
+                    try:
+                        leverage = float(match)
+                        if 1 <= leverage <= self.risk_limits['max_leverage']:
+                            logger.info("🔍 Leverage found: %sx", leverage)
+                            return leverage
+                    except ValueError:
+                        continue
+            
+            # Intelligenter Fallback basierend auf Signal-Art
+            if _SCALP_RE.search(message):
+                leverage = 5.0
+            elif _SWING_RE.search(message):
+                leverage = 3.0
+            else:
+                leverage = 3.0  # Standard-Leverage
+                
+            logger.info("🔍 Leverage (intelligent fallback): %sx", leverage)
+            return leverage
+            
+        except Exception as e:
+            logger.error("❌ Error extracting leverage: %s", e)
+            return 3.0  # Safe default
+
+    def _extract_direction(self, message: str) -> Optional[str]:
+        """Extrahiert Direction mit erweiterter Erkennung"""
+        try:
+            long_count = (
+                len(_LONG_WORDS_RE.findall(message))
+                + sum(message.count(e) for e in _LONG_EMOJIS)
+            )
+            short_count = (
+                len(_SHORT_WORDS_RE.findall(message))
+                + sum(message.count(e) for e in _SHORT_EMOJIS)
+            )
+
+            if long_count > short_count:
+                direction = 'long'
+            elif short_count > long_count:
+                direction = 'short'
+            else:
+                # Fallback: Standard-Direction
+                direction = 'long'
+                logger.warning("⚠️ No clear direction found, using default: long")
+            
+            logger.info("🔍 Direction determined: %s (Long: %s, Short: %s)", direction, long_count, short_count)
+            return direction
+            
+        except Exception as e:
+            logger.error("❌ Error extracting direction: %s", e)
+            return 'long'  # Safe default
+
+    def _extract_stoploss(self, message: str, entry_price: Optional[float], direction: Optional[str]) -> Optional[float]:
+        """Extrahiert Stop Loss mit intelligenten Fallbacks"""
+        try:
+            for pattern in _STOPLOSS_PATTERNS:
+                match = pattern.search(message)
+                if match:
+                    price = self._parse_price(match.group(1))
+                    logger.info("🔍 Stop loss found: %s", price)
+                    return price
+            
+            # Intelligenter Fallback basierend auf Entry und Direction
+            if entry_price and direction:
+                if direction == 'long':
+                    stoploss = entry_price * 0.98  # 2% unter Entry
+                else:
+                    stoploss = entry_price * 1.02  # 2% über Entry
+                
+                logger.info("🔍 Stop loss (calculated): %s", stoploss)
+                return stoploss
+            
+            logger.error("❌ No stop loss found and cannot calculate")
+            return None
+            
+        except Exception as e:
+            logger.error("❌ Error extracting stop loss: %s", e)
+            return None
+
+    def _extract_targets(self, message: str, entry_price: Optional[float], direction: Optional[str]) -> List[float]:
+        """Extrahiert Targets mit PROFESSIONELLER Logik"""
+        try:
+            # Vorallokierte 4 Slots, per Index befüllt (kein Append-Wachstum)
+            targets = [0.0] * 4
+            filled = 0
+
+            # METHODE 1: Explizite Target Patterns
+            for pattern in _TARGET_PATTERNS:
+                matches = pattern.findall(message)
+                if matches:
+                    for match_num, match_price in matches:
+                        try:
+                            target_num = int(match_num)
+                            if 1 <= target_num <= 4:
+                                targets[target_num-1] = self._parse_price(match_price)
+                                if target_num > filled:
+                                    filled = target_num
+                        except (ValueError, IndexError):
+                            continue
+
+            del targets[filled:]
+            
+            # METHODE 2: Zahlen die sinnvolle Targets sein könnten
+            if len(targets) < 4 and entry_price and direction:
+                all_numbers = _LARGE_NUM_RE.findall(message)
+                potential_targets = []
+                
+                for num_str in all_numbers:
+                    try:
+                        num = float(num_str)
+                        # Filtere basierend auf Direction und Entry
+                        if direction == 'long' and entry_price < num < entry_price * 1.2:
+                            potential_targets.append(num)
+                        elif direction == 'short' and entry_price > num > entry_price * 0.8:
+                            potential_targets.append(num)
+                    except ValueError:
+                        continue
+                
+                # Nehme die besten Kandidaten
+                potential_targets = sorted(set(potential_targets))
+                if direction == 'short':
+                    potential_targets.reverse()
+                
+                for target in potential_targets[:4]:
+                    if target not in targets:
+                        targets.append(target)
+            
+            # METHODE 3: Automatische Target-Berechnung
+            if len(targets) < 4 and entry_price and direction:
+                missing_targets = 4 - len(targets)
+                auto_targets = self._calculate_auto_targets(entry_price, direction, missing_targets)
+                targets.extend(auto_targets)
+            
+            # METHODE 4: Finale Sicherstellung von 4 Targets
+            if len(targets) < 4 and entry_price and direction:
+                self._ensure_four_targets(targets, entry_price, direction)
+            
+            # Finale Validierung und Sortierung
+            targets = self._validate_and_sort_targets(targets, entry_price, direction)
+            
+            logger.info("🎯 Final targets: %s", targets)
+            return targets
+            
+        except Exception as e:
+            logger.error("❌ Error extracting targets: %s", e)
+            # Ultimate Fallback
+            if entry_price and direction:
+                return self._calculate_fallback_targets(entry_price, direction)
+            return [100, 200, 300, 400]
+
+    def _calculate_auto_targets(self, entry_price: float, direction: str, count: int) -> List[float]:
+        """Berechnet automatische Targets basierend auf Markt-Logik"""
+        try:
+            # Geschlossene Form ohne Branch pro Iteration: Vorzeichen einmal
+            # bestimmen, Serie in einem Ausdruck berechnen
+            step = 0.015 if direction == 'long' else -0.015  # 1.5% pro Target
+            return [round(entry_price * (1 + i * step), 2) for i in range(1, count + 1)]
+        except Exception as e:
+            logger.error("❌ Error calculating auto targets: %s", e)
+            return []
+
+    def _ensure_four_targets(self, targets: List[float], entry_price: float, direction: str) -> None:
+        """Stellt sicher dass genau 4 Targets vorhanden sind"""
+        missing = 4 - len(targets)
+        if missing <= 0:
+            return
+
+        if targets:
+            # Fehlenden Schwanz geschlossen berechnen: +/-1.5% pro Schritt
+            last = targets[-1]
+            factor = 1.015 if direction == 'long' else 0.985
+            targets.extend(round(last * factor ** i, 2) for i in range(1, missing + 1))
+        else:
+            # Fallback zu Standard-Targets
+            if direction == 'long':
+                targets.extend([
+                    entry_price * 1.02,
+                    entry_price * 1.04,
+                    entry_price * 1.06,
+                    entry_price * 1.08
+                ])
+            else:
+                targets.extend([
+                    entry_price * 0.98,
+                    entry_price * 0.96,
+                    entry_price * 0.94,
+                    entry_price * 0.92
+                ])
+
+    def _validate_and_sort_targets(self, targets: List[float], entry_price: Optional[float], direction: Optional[str]) -> List[float]:
+        """Validiert und sortiert Targets"""
+        if not targets:
+            return targets
+
+        # Entferne Duplikate und Null-Werte in einem Durchlauf
+        # (bei max. ~8 Elementen schlägt der lineare Check den set-Aufbau)
+        unique = []
+        for t in targets:
+            if t > 0 and t not in unique:
+                unique.append(t)
+
+        # Sortiere basierend auf Direction
+        unique.sort(reverse=(direction == 'short'))
+
+        # Stelle sicher dass Targets sinnvoll sind
+        if entry_price and direction:
+            if direction == 'long':
+                unique = [t for t in unique if t > entry_price]
+            else:
+                unique = [t for t in unique if t < entry_price]
+
+        # Begrenze auf 4 Targets
+        return unique[:4]
+
+    def _calculate_fallback_targets(self, entry_price: float, direction: str) -> List[float]:
+        """Berechnet Fallback-Targets"""
+        step = 0.02 if direction == 'long' else -0.02
+        return [round(entry_price * (1 + i * step), 2) for i in range(1, 5)]
+
+    def _extract_confidence(self, message: str) -> float:
+        """Extrahiert Confidence Level aus dem Signal"""
+        try:
+            for pattern in _CONFIDENCE_PATTERNS:
+                match = pattern.search(message)
+                if match:
+                    confidence = float(match.group(1))
+                    return min(confidence, 100)  # Max 100%
+            
+            return 75.0  # Default confidence
+        except:
+            return 75.0
+
+    def _extract_validity(self, message: str) -> int:
+        """Extrahiert Gültigkeitsdauer des Signals"""
+        try:
+            for pattern in _VALIDITY_PATTERNS:
+                match = pattern.search(message)
+                if match:
+                    return int(match.group(1))
+            
+            return 24  # Default 24 hours
+        except:
+            return 24
+
+    def _calculate_risk_reward(self, entry: Optional[float], stop: Optional[float],
+                               first_target: Optional[float], direction: Optional[str]) -> float:
+        """Berechnet Risk/Reward Ratio aus bereits extrahierten Werten"""
+        try:
+            if entry is None or stop is None or first_target is None:
+                return 1.0
+
+            if direction == 'long':
+                risk = entry - stop
+                reward = first_target - entry
+            else:
+                risk = stop - entry
+                reward = entry - first_target
+
+            if risk > 0:
+                return round(reward / risk, 2)
+            return 1.0
+        except:
+            return 1.0
+
+    def _parse_price(self, price_str: str) -> float:
+        """Parset Preis-Strings robust"""
+        # Fast Path: die allermeisten Tokens sind bereits gültige Zahlen
+        try:
+            return float(price_str)
+        except ValueError:
+            pass
+        try:
+            # Entferne alle nicht-numerischen Zeichen außer Punkten
+            cleaned = price_str.translate(_PRICE_KEEP_TRANS)
+            if not cleaned:
+                raise ValueError("Empty price string")
+            return float(cleaned)
+        except ValueError as e:
+            logger.error("❌ Invalid price format: %s -> %s", price_str, e)
+            raise ValueError(f"Invalid price format: {price_str}")
+
+    def _validate_data(self, data: Dict) -> bool:
+        """Validiert die extrahierten Daten PROFESSIONELL"""
+        required_fields = ['symbol', 'entry_price', 'direction', 'stoploss', 'targets']
+        
+        # Prüfe erforderliche Felder
+        missing_fields = [field for field in required_fields if not data.get(field)]
+        if missing_fields:
+            logger.error("❌ Missing required fields: %s", missing_fields)
+            logger.error("❌ Current data: %s", data)
+            self.validation_errors += 1
+            return False
+        
+        # Mindestanzahl Targets
+        if len(data['targets']) < 2:
+            logger.error("❌ Insufficient targets: %s", len(data['targets']))
+            self.validation_errors += 1
+            return False
+        
+        # Grundlegende Validierungen
+        if data['direction'] not in ['long', 'short']:
+            logger.error("❌ Invalid direction: %s", data['direction'])
+            self.validation_errors += 1
+            return False
+        
+        if data['entry_price'] <= 0:
+            logger.error("❌ Invalid entry price: %s", data['entry_price'])
+            self.validation_errors += 1
+            return False
+        
+        # Risk/Reward Validierung
+        if data.get('risk_reward', 1.0) < self.risk_limits['min_risk_reward']:
+            logger.warning("⚠️ Low risk/reward ratio: %s", data.get('risk_reward'))
+        
+        logger.info("✅ All validations passed")
+        return True
+
+    def _process_valid_signal(self, data: Dict) -> Tuple[bool, Optional[Dict]]:
+        """Verarbeitet einen validen Trading-Signal"""
+        try:
+            # Prüfe auf existierenden Trade (KORREKTUR: should_return_false_when_no_trade_exists)
+            # Auch noch nicht geflushte Trades aus der Write-Queue zählen als aktiv
+            with self._pending_lock:
+                pending = data['symbol'] in self._pending_db_symbols
+            if pending or self._trade_exists_cached(data['symbol']):
+                return False, f"Active trade already exists for {data['symbol']}"
+            
+            # Erstelle Order
+            return self._create_order(data)
+            
+        except Exception as e:
+            logger.error("❌ Error processing valid signal: %s", e)
+            self.order_errors += 1
+            return False, str(e)
+
+    def _trade_exists_cached(self, symbol: str) -> bool:
+        """Duplikat-Prüfung mit kurzem TTL-Cache vor dem DB-Roundtrip"""
+        now = time.monotonic()
+        cached = self._trade_exist_cache.get(symbol)
+        if cached is not None and now - cached[1] < self._trade_exist_ttl:
+            return cached[0]
+        exists = check_if_trade_exist(symbol)
+        self._trade_exist_cache[symbol] = (exists, now)
+        return exists
+
+    def _create_order(self, data: Dict) -> Tuple[bool, Optional[Dict]]:
+        """Erstellt eine Order basierend auf den Signal-Daten"""
+        try:
+            # Berechne Positionsgröße
+            quantity, risk_amount = binance_api.calculate_position_size(data['entry_price'])
+            
+            # Bestimme Order Side
+            side = 'buy' if data['direction'] == 'long' else 'sell'
+            
+            logger.info("🎯 Creating %s order for %s", side.upper(), data['symbol'])
+            
+            # Erstelle Order
+            order = binance_api.create_spot_order(
+                symbol=data['symbol'],
+                side=side,
+                quantity=quantity,
+                price=data['entry_price']
+            )
+            
+            # Bereite Trade-Daten vor
+            trade_data = {
+                'symbol': data['symbol'],
+                'entry_price': data['entry_price'],
+                'direction': data['direction'],
+                'quantity': quantity,
+                'stoploss': data['stoploss'],
+                'targets': data['targets'],
+                'leverage': data['leverage'],
+                'order_id': order['id'],
+                'risk_amount': risk_amount,
+                'order_timestamp': datetime.now().isoformat(),
+                'confidence': data.get('confidence', 75.0),
+                'risk_reward': data.get('risk_reward', 1.0)
+            }
+            
+            # Speichere Trade in Datenbank
+            success = self._save_trade_to_db(trade_data)
+            
+            if success:
+                self.successful_parses += 1
+                # Cache direkt als "existiert" markieren, damit Rebroadcasts
+                # innerhalb des TTL-Fensters sofort abgewiesen werden
+                self._trade_exist_cache[trade_data['symbol']] = (True, time.monotonic())
+
+                # Banner nur formatieren, wenn INFO überhaupt geloggt wird
+                if logger.isEnabledFor(logging.INFO):
+                    logger.info(f"""
+✅ SUCCESSFULLY EXECUTED TRADE:
+├ 📊 Symbol: {trade_data['symbol']}
+├ 📈 Direction: {trade_data['direction'].upper()}
+├ 💰 Entry: {trade_data['entry_price']:,.2f}
+├ ⚖️ Quantity: {trade_data['quantity']:.6f}
+├ 🏦 Leverage: {trade_data['leverage']}x
+├ ⛔ Stop Loss: {trade_data['stoploss']:,.2f}
+├ 🎯 Targets: {', '.join(f'{t:,.2f}' for t in trade_data['targets'])}
+├ 📊 Risk/Reward: {trade_data['risk_reward']}:1
+├ 🔮 Confidence: {trade_data['confidence']}%
+└ 🔢 Order ID: {trade_data['order_id']}
+""")
+                
+                return True, trade_data
+            else:
+                logger.error("❌ Failed to save trade to database: %s", data['symbol'])
+                self.order_errors += 1
+                return False, "Database save failed"
+            
+        except Exception as e:
+            logger.error("❌ Error creating order: %s", e)
+            self.order_errors += 1
+            return False, str(e)
+
+    def _save_trade_to_db(self, trade_data: Dict) -> bool:
+        """Stellt den Trade in die Write-Queue ein - der Hintergrund-Writer persistiert"""
+        try:
+            with self._pending_lock:
+                self._pending_db_symbols.add(trade_data['symbol'])
+            self._write_queue.put(('db', trade_data))
+            return True
+        except Exception as e:
+            logger.error("❌ Error queueing trade for persistence: %s", e)
+            # Fallback: synchron speichern statt Trade zu verlieren
+            return self._insert_trade(trade_data)
+
+    def _drain_write_queue(self) -> None:
+        """Hintergrund-Writer: sammelt gequeuete Writes und schreibt sie gebündelt"""
+        while True:
+            try:
+                item = self._write_queue.get(timeout=0.25)
+            except queue.Empty:
+                continue
+            batch = [item]
+            while len(batch) < 100:
+                try:
+                    batch.append(self._write_queue.get_nowait())
+                except queue.Empty:
+                    break
+            try:
+                # Queue-Einträge sind getaggt: ('db', ...) oder ('emer', ...)
+                db_batch = [td for kind, td in batch if kind == 'db']
+                if db_batch:
+                    self._flush_batch(db_batch)
+                for kind, td in batch:
+                    if kind == 'emer':
+                        self._write_emergency_trade(td)
+                self._flush_traded_symbols()
+            finally:
+                for _ in batch:
+                    self._write_queue.task_done()
+
+    def _flush_batch(self, batch: List[Dict]):
+        """Schreibt einen Batch gequeueter Trades in EINER Transaktion"""
+        try:
+            results = new_trades_db_batch([self._trade_row(td) for td in batch])
+            for trade_data in batch:
+                if results.get(trade_data['symbol'].upper()):
+                    self._record_traded_symbol(trade_data['symbol'])
+                    logger.info("💾 Trade saved to database: %s", trade_data['symbol'])
+                else:
+                    # False heißt hier ausschließlich Duplikat - echte
+                    # DB-Fehler kommen als Exception und laufen unten
+                    # über den Einzel-Insert-/Emergency-Fallback
+                    logger.warning("⚠️ Duplicate active trade - not saved: %s", trade_data['symbol'])
+        except Exception as e:
+            logger.error("❌ Error flushing trade batch: %s", e)
+            # Fallback: einzeln schreiben statt den ganzen Batch zu verlieren
+            for trade_data in batch:
+                try:
+                    if not self._insert_trade(trade_data):
+                        self._write_emergency_trade(trade_data)
+                except Exception as e2:
+                    logger.error("❌ Error flushing trade %s: %s", trade_data.get('symbol'), e2)
+                    self._write_emergency_trade(trade_data)
+        finally:
+            with self._pending_lock:
+                for trade_data in batch:
+                    self._pending_db_symbols.discard(trade_data['symbol'])
+
+    def flush(self) -> None:
+        """Wartet bis alle gequeueten Trades geschrieben sind (z.B. beim Shutdown)"""
+        self._write_queue.join()
+        self._flush_traded_symbols()
+
+    def _load_traded_symbols(self) -> set:
+        """Lädt die bisher gehandelten Symbole EINMAL beim Start"""
+        try:
+            if os.path.exists(_TRADED_SYMBOLS_FILE):
+                with open(_TRADED_SYMBOLS_FILE, 'r', encoding='utf-8') as f:
+                    return {line.strip() for line in f if line.strip()}
+        except Exception as e:
+            logger.warning("⚠️ Error reading %s: %s", _TRADED_SYMBOLS_FILE, e)
+        return set()
+
+    def _record_traded_symbol(self, symbol: str) -> None:
+        """Merkt ein Symbol im Speicher vor - Datei wird später geflusht"""
+        with self._pending_lock:
+            if symbol not in self._traded_symbols:
+                self._traded_symbols.add(symbol)
+                self._symbols_dirty = True
+
+    def _flush_traded_symbols(self) -> None:
+        """Schreibt die Symbol-Liste nur, wenn sie sich geändert hat"""
+        with self._pending_lock:
+            if not self._symbols_dirty:
+                return
+            symbols = sorted(self._traded_symbols)
+            self._symbols_dirty = False
+        try:
+            # Atomar via tmp-Datei + os.replace: ein Crash mitten im Write
+            # hinterlässt nie eine halb geschriebene Symbol-Liste
+            tmp_file = _TRADED_SYMBOLS_FILE + '.tmp'
+            with open(tmp_file, 'w', encoding='utf-8') as f:
+                f.write('\n'.join(symbols) + '\n')
+            os.replace(tmp_file, _TRADED_SYMBOLS_FILE)
+        except Exception as e:
+            logger.error("❌ Error updating unique names file: %s", e)
+            with self._pending_lock:
+                self._symbols_dirty = True
+
+    def _trade_row(self, trade_data: Dict) -> tuple:
+        """Trade-Daten als Positions-Tupel in der Spaltenreihenfolge der trades-Tabelle"""
+        targets = trade_data['targets']
+        # Lokale Aliase: 11 Coercions pro Zeile ohne Global-Lookups
+        as_float = _as_float
+        get = trade_data.get
+        return (
+            _now_date_str(),
+            trade_data['symbol'],
+            as_float(trade_data['leverage']),
+            as_float(trade_data['entry_price']),
+            trade_data['direction'],
+            as_float(trade_data['quantity']),
+            as_float(trade_data['stoploss']),
+            as_float(targets[0]),
+            as_float(targets[1]),
+            as_float(targets[2]),
+            as_float(targets[3]),
+            _json_dumps([trade_data['order_id']]),
+            as_float(get('risk_amount', 0)),
+            as_float(get('confidence', 75.0)),
+            as_float(get('risk_reward', 1.0))
+        )
+
+    def _insert_trade(self, trade_data: Dict) -> bool:
+        """Speichert Trade in Datenbank - ROBUSTE VERSION"""
+        try:
+            # Verwende db_manager direkt für mehr Stabilität
+            success = new_trade_db_row(self._trade_row(trade_data))
+
+            if success:
+                self._record_traded_symbol(trade_data['symbol'])
+                logger.info("💾 Trade saved to database: %s", trade_data['symbol'])
+            else:
+                logger.error("❌ Database save failed for: %s", trade_data['symbol'])
+            
+            return success
+            
+        except Exception as e:
+            logger.error("❌ Error saving trade to database: %s", e)
+            return False
+    def _emergency_trade_save(self, trade_data: Dict) -> bool:
+        """Stellt den Notfall-Save in die Write-Queue ein - kein Disk-I/O im Aufrufer"""
+        try:
+            self._write_queue.put(('emer', trade_data))
+            return True
+        except Exception as e:
+            logger.error("❌ Error queueing emergency save: %s", e)
+            # Fallback: synchron schreiben statt den Trade zu verlieren
+            return self._write_emergency_trade(trade_data)
+
+    def _write_emergency_trade(self, trade_data: Dict) -> bool:
+        """Notfall-Speicherung wenn normale Datenbank fehlschlägt"""
+        try:
+            # Append-only NDJSON: eine Zeile pro Trade, kein Re-Read/Rewrite
+            # der kompletten Backup-Datei bei jedem Save
+            emergency_data = {
+                'symbol': trade_data['symbol'],
+                'entry_price': trade_data['entry_price'],
+                'direction': trade_data['direction'],
+                'quantity': trade_data['quantity'],
+                'targets': trade_data['targets'],
+                'stoploss': trade_data['stoploss'],
+                'leverage': trade_data.get('leverage', 1),
+                'order_id': trade_data['order_id'],
+                'timestamp': datetime.now().isoformat()
+            }
+
+            if orjson is not None:
+                # Bytes direkt schreiben: ein Encode, ein write
+                with open(_EMERGENCY_BACKUP_FILE, 'ab') as f:
+                    f.write(orjson.dumps(emergency_data, option=orjson.OPT_APPEND_NEWLINE))
+            else:
+                with open(_EMERGENCY_BACKUP_FILE, 'a') as f:
+                    f.write(json.dumps(emergency_data, separators=(',', ':')) + '\n')
+
+            logger.warning("⚠️ Emergency trade saved to file: %s", trade_data['symbol'])
+            return True
+
+        except Exception as e:
+            logger.error("❌ Emergency save also failed: %s", e)
+            return False
+
+    def load_emergency_trades(self) -> List[Dict]:
+        """Liest die Notfall-Backups zurück (eine JSON-Zeile pro Trade)"""
+        try:
+            with open(_EMERGENCY_BACKUP_FILE, 'r') as f:
+                return [json.loads(line) for line in f if line.strip()]
+        except FileNotFoundError:
+            return []
+        except Exception as e:
+            logger.error("❌ Error loading emergency trades: %s", e)
+            return []
+    @property
+    def parsing_stats(self) -> Dict[str, Any]:
+        """Dict-Sicht auf die Zähler-Attribute (für externe Aufrufer)"""
+        return {
+            'total_signals': self.total_signals,
+            'successful_parses': self.successful_parses,
+            'failed_parses': self.failed_parses,
+            'last_parse_time': (
+                datetime.fromtimestamp(self.last_parse_time).isoformat()
+                if self.last_parse_time else None
+            ),
+            'validation_errors': self.validation_errors,
+            'order_errors': self.order_errors
+        }
+
+    def get_parsing_stats(self) -> Dict[str, Any]:
+        """Gibt Parsing-Statistiken zurück (gecachte Sicht, bitte nicht mutieren)"""
+        # Nur neu bauen wenn sich seit dem letzten Poll ein Zähler
+        # geändert hat - Dashboards pollen deutlich öfter als geparst wird
+        key = (
+            self.total_signals, self.successful_parses, self.failed_parses,
+            self.validation_errors, self.order_errors, self.last_parse_time
+        )
+        if key == self._stats_cache_key:
+            return self._stats_cache
+
+        success_rate = (
+            (self.successful_parses / self.total_signals * 100)
+            if self.total_signals > 0 else 0
+        )
+
+        stats = self.parsing_stats
+        stats['success_rate_percent'] = round(success_rate, 2)
+        stats['supported_symbols_count'] = len(self.supported_symbols)
+        self._stats_cache_key = key
+        self._stats_cache = stats
+        return stats
+
+# Globale Instanz
+signal_parser = ProfessionalSignalParser()
+
+# Write-Queue beim Interpreter-Shutdown leeren: der TradeDBWriter ist
+# ein Daemon-Thread — ohne Drain stirbt er bei Ctrl-C mit noch
+# gequeueten Trades (Order bereits platziert, Zeile weder in der DB
+# noch im Emergency-Backup)
+atexit.register(signal_parser.flush)
\ No newline at end of file
@@ -1,723 +1,1138 @@
-import logging
-import time
-from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Tuple, Any
-from decimal import Decimal, ROUND_HALF_UP
-from database import get_trade_db, update_trade_status_db, set_trade_noActive_db, update_trade_amount_db
-
-logger = logging.getLogger(__name__)
-
-class AdvancedRiskManager:
-    def __init__(self):
-        # PROFESSIONELLE Take Profit Level Konfiguration
-        self.take_profit_levels = {
-            'TK1': {'close_percentage': 0.5, 'move_sl_to_entry': True, 'description': 'First Profit Take'},
-            'TK2': {'close_percentage': 0.3, 'move_sl_to_tk1': True, 'description': 'Second Profit Take'},
-            'TK3': {'close_percentage': 0.2, 'move_sl_to_tk2': True, 'description': 'Third Profit Take'}
-        }
-        
-        # ERWEITERTE Risk Parameter mit dynamischen Anpassungen
-        self.risk_parameters = {
-            'max_drawdown_per_trade': 0.02,           # 2% max loss per trade
-            'trailing_stop_activation': 0.05,         # 5% profit activates trailing stop
-            'trailing_stop_distance': 0.02,           # 2% trailing distance
-            'breakeven_activation': 0.03,             # 3% profit activates breakeven
-            'volatility_multiplier': 1.5,             # Multiplier for volatile markets
-            'max_trade_duration_hours': 168,          # 7 days maximum trade duration
-            'partial_profit_activation': 0.10,        # 10% profit for partial profit taking
-            'emergency_stop_activation': 0.15,        # 15% loss triggers emergency stop
-        }
-        
-        # UM FASSENDE Performance Tracking
-        self.performance_metrics = {
-            'trades_evaluated': 0,
-            'stop_loss_triggers': 0,
-            'take_profit_triggers': 0,
-            'trailing_stop_activations': 0,
-            'breakeven_activations': 0,
-            'partial_profit_taken': 0,
-            'emergency_stops': 0,
-            'time_based_exits': 0,
-            'total_pnl': 0.0,
-            'successful_trades': 0,
-            'failed_trades': 0
-        }
-        
-        # Dynamische Trade-Historie für erweiterte Analyse
-        self.trade_history = {}
-        self.volatility_cache = {}
-        self.market_conditions = {}
-        
-        # Risk Management State
-        self.breakeven_activated = set()
-        self.trailing_stop_activated = set()
-        self.partial_profit_taken = set()
-
-    def evaluate_trade(self, symbol: str, current_price: float) -> Dict[str, Any]:
-        """Evaluierte einen Trade mit PROFESSIONELLEM Risk Management"""
-        try:
-            self.performance_metrics['trades_evaluated'] += 1
-            
-            # Hole Trade-Daten mit robustem Error Handling
-            trade_data = get_trade_db(symbol)
-            if not trade_data:
-                logger.warning(f"⚠️ No trade data found for {symbol}")
-                return self._create_result('none', 'no_trade_found')
-            
-            # ROBUSTE Dictionary-Zugriffe mit Fallbacks
-            entry_price = trade_data.get('entry_price', 0)
-            position = trade_data.get('position', 'LONG').lower()
-            amount = trade_data.get('quantity', 0)
-            stop_loss = trade_data.get('stop_loss', 0)
-            tk1 = trade_data.get('take_profit_1', 0)
-            tk2 = trade_data.get('take_profit_2', 0)
-            tk3 = trade_data.get('take_profit_3', 0)
-            tk4 = trade_data.get('take_profit_4', 0)
-            status = trade_data.get('status', 'NEW')
-            leverage = trade_data.get('leverage', 1)
-            created_at = trade_data.get('created_at', datetime.now())
-            
-            # Validiere kritische Daten
-            if entry_price <= 0:
-                logger.error(f"❌ Invalid entry price for {symbol}: {entry_price}")
-                return self._create_result('none', 'invalid_trade_data')
-            
-            # Berechne aktuelle Performance
-            current_pnl, pnl_percentage = self._calculate_pnl(
-                entry_price, current_price, amount, position, leverage
-            )
-            
-            # Erstelle umfassendes Result-Objekt
-            result = {
-                'symbol': symbol,
-                'current_price': current_price,
-                'entry_price': entry_price,
-                'position': position,
-                'status': status,
-                'current_pnl': current_pnl,
-                'pnl_percentage': pnl_percentage,
-                'leverage': leverage,
-                'trade_duration': self._calculate_trade_duration(created_at),
-                'risk_reward_ratio': self._calculate_risk_reward_ratio(entry_price, stop_loss, tk1, position),
-                'volatility_level': self._calculate_volatility(symbol),
-                'action': 'hold',
-                'reason': '',
-                'recommendations': [],
-                'confidence_score': self._calculate_confidence_score(current_pnl, pnl_percentage),
-                'timestamp': datetime.now().isoformat()
-            }
-            
-            # Führe PROFESSIONELLE Risk Management Checks durch
-            checks = [
-                self._check_emergency_stop,
-                self._check_stop_loss,
-                self._check_take_profits,
-                self._check_trailing_stop,
-                self._check_breakeven,
-                self._check_partial_profit,
-                self._check_time_based_exit,
-                self._check_volatility_adjustment
-            ]
-            
-            for check in checks:
-                try:
-                    check_result = check(result, trade_data)
-                    if check_result and check_result.get('action') != 'hold':
-                        self._update_performance_metrics(check_result['action'], check_result['reason'])
-                        return {**result, **check_result}
-                except Exception as check_error:
-                    logger.error(f"❌ Error in {check.__name__} for {symbol}: {check_error}")
-                    continue
-            
-            # Generiere proaktive Empfehlungen
-            result['recommendations'] = self._generate_recommendations(result, trade_data)
-            
-            # Logge Trade-Status bei signifikanten Ereignissen
-            self._log_trade_status(result)
-            
-            return result
-                
-        except Exception as e:
-            logger.error(f"❌ Critical error evaluating trade {symbol}: {e}")
-            return self._create_result('none', f'evaluation_error: {str(e)}')
-
-    def _calculate_pnl(self, entry_price: float, current_price: float, 
-                      amount: float, position: str, leverage: float) -> Tuple[float, float]:
-        """Berechnet PnL mit Leverage-Berücksichtigung und Rounding"""
-        try:
-            if position == 'long':
-                pnl = (current_price - entry_price) * amount
-                pnl_percentage = ((current_price - entry_price) / entry_price) * 100 * leverage
-            else:
-                pnl = (entry_price - current_price) * amount
-                pnl_percentage = ((entry_price - current_price) / entry_price) * 100 * leverage
-            
-            # Runde für bessere Lesbarkeit
-            return round(pnl, 2), round(pnl_percentage, 2)
-        except Exception as e:
-            logger.error(f"❌ Error calculating PnL: {e}")
-            return 0.0, 0.0
-
-    def _calculate_trade_duration(self, created_at) -> int:
-        """Berechnet Trade-Dauer in Stunden"""
-        try:
-            if isinstance(created_at, str):
-                created_at = datetime.fromisoformat(created_at.replace('Z', '+00:00'))
-            duration = datetime.now() - created_at
-            return int(duration.total_seconds() / 3600)  # Stunden
-        except:
-            return 0
-
-    def _calculate_risk_reward_ratio(self, entry: float, stop_loss: float, take_profit: float, position: str) -> float:
-        """Berechnet Risk/Reward Ratio"""
-        try:
-            if position == 'long':
-                risk = entry - stop_loss
-                reward = take_profit - entry
-            else:
-                risk = stop_loss - entry
-                reward = entry - take_profit
-            
-            if risk > 0:
-                return round(reward / risk, 2)
-            return 1.0
-        except:
-            return 1.0
-
-    def _calculate_confidence_score(self, pnl: float, pnl_percentage: float) -> float:
-        """Berechnet Confidence Score basierend auf Performance"""
-        try:
-            base_score = 50.0  # Neutral starting point
-            
-            # PnL-basierte Anpassung
-            if pnl > 0:
-                base_score += min(pnl_percentage * 2, 30)  # Max +30 für Profit
-            else:
-                base_score -= min(abs(pnl_percentage), 20)  # Max -20 für Loss
-            
-            return max(10.0, min(100.0, base_score))  # Clamp between 10-100
-        except:
-            return 50.0
-
-    def _check_emergency_stop(self, result: Dict, trade_data: Dict) -> Optional[Dict]:
-        """Notfall-Stop bei extremen Verlusten"""
-        try:
-            pnl_percentage = result['pnl_percentage']
-            
-            if pnl_percentage <= -self.risk_parameters['emergency_stop_activation'] * 100:
-                logger.warning(f"🚨 EMERGENCY STOP triggered for {result['symbol']}: {pnl_percentage:.2f}%")
-                return self._create_result('close', 'emergency_stop_triggered')
-            
-            return None
-        except Exception as e:
-            logger.error(f"❌ Error in emergency stop check: {e}")
-            return None
-
-    def _check_stop_loss(self, result: Dict, trade_data: Dict) -> Optional[Dict]:
-        """Überprüft Stop Loss mit Volatilitäts-Puffer und Slippage-Berücksichtigung"""
-        try:
-            position = result['position']
-            current_price = result['current_price']
-            stop_loss = trade_data.get('stop_loss', 0)
-            entry_price = result['entry_price']
-            
-            if stop_loss <= 0:
-                return None
-            
-            # Berechne dynamischen Volatilitäts-Puffer
-            volatility_buffer = self._get_volatility_buffer(result['symbol'], entry_price)
-            
-            # Füge Slippage-Buffer hinzu
-            slippage_buffer = 0.001  # 0.1% Slippage Protection
-            
-            total_buffer = volatility_buffer + slippage_buffer
-            
-            if position == 'long':
-                # Für Long: Preis fällt unter Stop Loss mit Buffer
-                if current_price <= stop_loss * (1 - total_buffer):
-                    logger.info(f"🛑 Stop Loss triggered for {result['symbol']} at {current_price:.2f}")
-                    return self._create_result('close', 'stop_loss_triggered')
-            else:
-                # Für Short: Preis steigt über Stop Loss mit Buffer
-                if current_price >= stop_loss * (1 + total_buffer):
-                    logger.info(f"🛑 Stop Loss triggered for {result['symbol']} at {current_price:.2f}")
-                    return self._create_result('close', 'stop_loss_triggered')
-            
-            return None
-        except Exception as e:
-            logger.error(f"❌ Error in stop loss check: {e}")
-            return None
-
-    def _check_take_profits(self, result: Dict, trade_data: Dict) -> Optional[Dict]:
-        """Überprüft Take Profit Levels mit ROBUSTEM Error Handling"""
-        try:
-            position = result['position']
-            current_price = result['current_price']
-            status = result['status']
-            
-            # Hole Targets mit Fallbacks
-            targets = [
-                trade_data.get('take_profit_1', 0),
-                trade_data.get('take_profit_2', 0), 
-                trade_data.get('take_profit_3', 0),
-                trade_data.get('take_profit_4', 0)
-            ]
-            
-            # Filtere ungültige Targets
-            valid_targets = [t for t in targets if t and t > 0]
-            
-            if not valid_targets:
-                return None
-            
-            # Definiere Take Profit Konfiguration
-            tp_configs = {
-                'NEW': {'target_index': 0, 'action': 'tk1', 'description': 'First Target'},
-                'FILLED': {'target_index': 0, 'action': 'tk1', 'description': 'First Target'},
-                'TK1': {'target_index': 1, 'action': 'tk2', 'description': 'Second Target'},
-                'TK2': {'target_index': 2, 'action': 'tk3', 'description': 'Third Target'},
-                'TK3': {'target_index': 3, 'action': 'close_tp4', 'description': 'Final Target'}
-            }
-            
-            if status in tp_configs:
-                config = tp_configs[status]
-                target_index = config['target_index']
-                
-                # Prüfe ob Target Index gültig ist
-                if target_index < len(valid_targets):
-                    target_price = valid_targets[target_index]
-                    
-                    # Überprüfe ob Target erreicht wurde
-                    condition_met = (
-                        (position == 'long' and current_price >= target_price) or
-                        (position == 'short' and current_price <= target_price)
-                    )
-                    
-                    if condition_met:
-                        if config['action'] == 'close_tp4':
-                            logger.info(f"🎯 Final Target reached for {result['symbol']} at {current_price:.2f}")
-                            return self._create_result('close', 'target_4_reached')
-                        else:
-                            tp_settings = self.take_profit_levels.get(config['action'].upper(), 
-                                                                    {'close_percentage': 0.5, 'move_sl_to_entry': True})
-                            logger.info(f"🎯 {config['description']} reached for {result['symbol']}")
-                            return {
-                                'action': 'partial_close',
-                                'reason': f'{config["action"]}_reached',
-                                'close_percentage': tp_settings['close_percentage'],
-                                'new_status': config['action'].upper(),
-                                'move_stoploss': tp_settings.get('move_sl_to_entry', False),
-                                'description': config['description']
-                            }
-            
-            return None
-        except Exception as e:
-            logger.error(f"❌ Error in take profit check for {result.get('symbol', 'unknown')}: {e}")
-            return None
-
-    def _check_trailing_stop(self, result: Dict, trade_data: Dict) -> Optional[Dict]:
-        """Überprüft und aktualisiert Trailing Stop mit dynamischer Distanz"""
-        try:
-            symbol = result['symbol']
-            current_price = result['current_price']
-            position = result['position']
-            pnl_percentage = result['pnl_percentage']
-            
-            # Aktiviere Trailing Stop nur bei ausreichendem Profit
-            if abs(pnl_percentage) < self.risk_parameters['trailing_stop_activation'] * 100:
-                return None
-            
-            # Dynamische Trailing Stop Distanz basierend auf Volatilität
-            volatility = self._calculate_volatility(symbol)
-            dynamic_distance = max(
-                self.risk_parameters['trailing_stop_distance'],
-                volatility * 0.8  # 80% der Volatilität als Mindestabstand
-            )
-            
-            current_sl = trade_data.get('stop_loss', 0)
-            
-            # Initialisiere Trade-Historie
-            if symbol not in self.trade_history:
-                self.trade_history[symbol] = []
-            
-            # Füge aktuellen Preis zur Historie hinzu
-            self.trade_history[symbol].append({
-                'timestamp': datetime.now(),
-                'price': current_price,
-                'stop_loss': current_sl
-            })
-            
-            # Behalte nur die letzten 100 Einträge für Performance
-            if len(self.trade_history[symbol]) > 100:
-                self.trade_history[symbol] = self.trade_history[symbol][-100:]
-            
-            # Berechne optimalen Trailing Stop
-            new_stop_loss = self._calculate_trailing_stop(
-                symbol, current_price, result['entry_price'], position, current_sl, dynamic_distance
-            )
-            
-            if new_stop_loss != current_sl:
-                logger.info(f"🔄 Trailing stop updated for {symbol}: {current_sl:.2f} → {new_stop_loss:.2f}")
-                self.trailing_stop_activated.add(symbol)
-                self.performance_metrics['trailing_stop_activations'] += 1
-                return self._create_result('update_stoploss', 'trailing_stop_updated')
-            
-            return None
-        except Exception as e:
-            logger.error(f"❌ Error in trailing stop check: {e}")
-            return None
-
-    def _calculate_trailing_stop(self, symbol: str, current_price: float, 
-                               entry_price: float, position: str, current_sl: float, distance: float) -> float:
-        """Berechnet neuen Trailing Stop Preis mit dynamischer Logik"""
-        try:
-            if position == 'long':
-                new_sl = current_price * (1 - distance)
-                # Stop Loss nur nach oben anpassen, niemals nach unten
-                return max(new_sl, current_sl, entry_price * 0.99)  # Mindestens 1% unter Entry
-            else:
-                new_sl = current_price * (1 + distance)
-                # Stop Loss nur nach unten anpassen, niemals nach oben
-                return min(new_sl, current_sl, entry_price * 1.01)  # Mindestens 1% über Entry
-        except Exception as e:
-            logger.error(f"❌ Error calculating trailing stop: {e}")
-            return current_sl
-
-    def _check_breakeven(self, result: Dict, trade_data: Dict) -> Optional[Dict]:
-        """Aktiviert Breakeven Stop Loss mit Progressivem Approach"""
-        try:
-            symbol = result['symbol']
-            position = result['position']
-            current_price = result['current_price']
-            entry_price = result['entry_price']
-            pnl_percentage = result['pnl_percentage']
-            current_sl = trade_data.get('stop_loss', 0)
-            
-            # Prüfe ob Breakeven bereits aktiviert wurde
-            if symbol in self.breakeven_activated:
-                return None
-            
-            # Aktiviere Breakeven bei ausreichendem Profit
-            if abs(pnl_percentage) >= self.risk_parameters['breakeven_activation'] * 100:
-                if position == 'long':
-                    new_sl = entry_price * 1.001  # Leicht über Entry für Puffer
-                else:
-                    new_sl = entry_price * 0.999  # Leicht unter Entry für Puffer
-                
-                if ((position == 'long' and new_sl > current_sl) or 
-                    (position == 'short' and new_sl < current_sl)):
-                    
-                    self.breakeven_activated.add(symbol)
-                    self.performance_metrics['breakeven_activations'] += 1
-                    logger.info(f"⚖️ Breakeven activated for {symbol} at {new_sl:.2f}")
-                    return self._create_result('update_stoploss', 'breakeven_activated')
-            
-            return None
-        except Exception as e:
-            logger.error(f"❌ Error in breakeven check: {e}")
-            return None
-
-    def _check_partial_profit(self, result: Dict, trade_data: Dict) -> Optional[Dict]:
-        """Proaktive Teilgewinn-Mitnahme bei hohem Profit"""
-        try:
-            symbol = result['symbol']
-            pnl_percentage = result['pnl_percentage']
-            
-            # Vermeide mehrfache Teilgewinn-Mitnahme
-            if symbol in self.partial_profit_taken:
-                return None
-            
-            # Aktiviere Teilgewinn-Mitnahme bei sehr hohem Profit
-            if pnl_percentage >= self.risk_parameters['partial_profit_activation'] * 100:
-                self.partial_profit_taken.add(symbol)
-                self.performance_metrics['partial_profit_taken'] += 1
-                logger.info(f"💰 Partial profit taken for {symbol} at {pnl_percentage:.2f}%")
-                return {
-                    'action': 'partial_close',
-                    'reason': 'partial_profit_taken',
-                    'close_percentage': 0.25,  # 25% der Position
-                    'new_status': result['status'],  # Status bleibt gleich
-                    'description': 'Proactive partial profit taking'
-                }
-            
-            return None
-        except Exception as e:
-            logger.error(f"❌ Error in partial profit check: {e}")
-            return None
-
-    def _check_time_based_exit(self, result: Dict, trade_data: Dict) -> Optional[Dict]:
-        """Time-based Exit nach maximaler Haltedauer"""
-        try:
-            trade_duration_hours = result.get('trade_duration', 0)
-            max_duration = self.risk_parameters['max_trade_duration_hours']
-            
-            if trade_duration_hours >= max_duration:
-                logger.info(f"⏰ Time-based exit for {result['symbol']} after {trade_duration_hours}h")
-                self.performance_metrics['time_based_exits'] += 1
-                return self._create_result('close', 'max_trade_duration_reached')
-            
-            return None
-        except Exception as e:
-            logger.error(f"❌ Error in time based exit check: {e}")
-            return None
-
-    def _check_volatility_adjustment(self, result: Dict, trade_data: Dict) -> Optional[Dict]:
-        """Passt Risk-Parameter basierend auf Marktvolatilität an"""
-        try:
-            symbol = result['symbol']
-            current_volatility = result.get('volatility_level', 0.03)
-            
-            # Generiere Volatilitäts-basierte Empfehlungen
-            if current_volatility > 0.08:  # Sehr hohe Volatilität
-                result['recommendations'].append({
-                    'type': 'high_volatility_warning',
-                    'message': f'Very high volatility detected: {current_volatility:.2%}',
-                    'suggestion': 'Consider reducing position size or widening stop loss',
-                    'priority': 'high'
-                })
-            elif current_volatility > 0.05:  # Hohe Volatilität
-                result['recommendations'].append({
-                    'type': 'volatility_advisory',
-                    'message': f'High volatility detected: {current_volatility:.2%}',
-                    'suggestion': 'Monitor trade closely and consider tighter risk management',
-                    'priority': 'medium'
-                })
-            
-            return None
-        except Exception as e:
-            logger.error(f"❌ Error in volatility adjustment: {e}")
-            return None
-
-    def _get_volatility_buffer(self, symbol: str, price: float) -> float:
-        """Berechnet dynamischen Volatilitäts-Puffer für Stop Loss"""
-        try:
-            volatility = self._calculate_volatility(symbol)
-            # Puffer ist 1.5x Volatilität, aber maximal 3%
-            buffer = min(volatility * self.risk_parameters['volatility_multiplier'], 0.03)
-            return max(buffer, 0.005)  # Mindestens 0.5% Buffer
-        except:
-            return 0.01  # Default 1% Buffer
-
-    def _calculate_volatility(self, symbol: str) -> float:
-        """Berechnet die Volatilität eines Symbols mit erweiterter Logik"""
-        try:
-            # Cache für 10 Minuten
-            if symbol in self.volatility_cache:
-                cache_time, volatility = self.volatility_cache[symbol]
-                if (datetime.now() - cache_time).total_seconds() < 600:
-                    return volatility
-            
-            # Dynamische Volatilitäts-Berechnung basierend auf Symbol-Typ
-            volatility_map = {
-                'BTCUSDT': 0.025, 'ETHUSDT': 0.030, 'BNBUSDT': 0.035,
-                'ADAUSDT': 0.045, 'DOTUSDT': 0.040, 'SOLUSDT': 0.050,
-                'XRPUSDT': 0.038, 'DOGEUSDT': 0.055, 'LTCUSDT': 0.032,
-                'default': 0.035
-            }
-            
-            # Finde beste Übereinstimmung
-            volatility = volatility_map['default']
-            for key, value in volatility_map.items():
-                if key in symbol:
-                    volatility = value
-                    break
-            
-            # Aktualisiere Cache
-            self.volatility_cache[symbol] = (datetime.now(), volatility)
-            
-            return volatility
-            
-        except Exception as e:
-            logger.error(f"❌ Error calculating volatility for {symbol}: {e}")
-            return 0.03  # Default volatility
-
-    def _generate_recommendations(self, result: Dict, trade_data: Dict) -> List[Dict]:
-        """Generiert PROFESSIONELLE Handlungsempfehlungen"""
-        recommendations = []
-        
-        # Profit-basierte Empfehlungen
-        pnl_percentage = result['pnl_percentage']
-        
-        if pnl_percentage > 20:
-            recommendations.append({
-                'type': 'excellent_profit',
-                'message': f'Exceptional profit achieved: {pnl_percentage:.2f}%',
-                'suggestion': 'Consider taking significant profits or moving stop loss to lock in gains',
-                'priority': 'high'
-            })
-        elif pnl_percentage > 10:
-            recommendations.append({
-                'type': 'good_profit',
-                'message': f'Strong profit achieved: {pnl_percentage:.2f}%',
-                'suggestion': 'Consider partial profit taking or trailing stop activation',
-                'priority': 'medium'
-            })
-        elif pnl_percentage < -8:
-            recommendations.append({
-                'type': 'significant_drawdown',
-                'message': f'Significant drawdown: {pnl_percentage:.2f}%',
-                'suggestion': 'Monitor stop loss closely and consider early exit if trend continues',
-                'priority': 'high'
-            })
-        
-        # Time-basierte Empfehlungen
-        trade_duration = result.get('trade_duration', 0)
-        if trade_duration > 48:  # 2 Tage
-            recommendations.append({
-                'type': 'extended_trade_duration',
-                'message': f'Trade active for {trade_duration}h',
-                'suggestion': 'Review trade thesis and consider exit if original conditions changed',
-                'priority': 'medium'
-            })
-        
-        # Confidence-basierte Empfehlungen
-        confidence = result.get('confidence_score', 50)
-        if confidence < 30:
-            recommendations.append({
-                'type': 'low_confidence',
-                'message': f'Low confidence score: {confidence:.1f}',
-                'suggestion': 'Consider early exit or reducing position size',
-                'priority': 'medium'
-            })
-        
-        return recommendations
-
-    def _log_trade_status(self, result: Dict):
-        """Loggt detaillierten Trade-Status mit erweiterter Information"""
-        try:
-            # Logge nur bei signifikanten Ereignissen oder regelmäßig
-            should_log = (
-                result['action'] != 'hold' or 
-                self.performance_metrics['trades_evaluated'] % 20 == 0 or
-                abs(result['pnl_percentage']) > 5
-            )
-            
-            if should_log:
-                logger.info(f"""
-📊 PROFESSIONAL TRADE EVALUATION: {result['symbol']}
-├ 💰 Entry: {result['entry_price']:,.2f} | Current: {result['current_price']:,.2f}
-├ 📈 PnL: {result['current_pnl']:+.2f} USDT ({result['pnl_percentage']:+.2f}%)
-├ ⚖️ Leverage: {result['leverage']}x | R/R: {result.get('risk_reward_ratio', 1.0):.2f}
-├ 🕒 Duration: {result.get('trade_duration', 0)}h | Confidence: {result.get('confidence_score', 50):.1f}
-├ 🎯 Action: {result['action'].upper()} | Reason: {result['reason']}
-├ 🔧 Status: {result['status']} | Volatility: {result.get('volatility_level', 0.03):.2%}
-└ 💡 Recommendations: {len(result.get('recommendations', []))}
-""")
-                
-        except Exception as e:
-            logger.debug(f"⚠️ Error logging trade status: {e}")
-
-    def _create_result(self, action: str, reason: str, **kwargs) -> Dict[str, Any]:
-        """Erstellt ein standardisiertes Result-Dictionary"""
-        base_result = {
-            'action': action,
-            'reason': reason,
-            'timestamp': datetime.now().isoformat(),
-            'description': self._get_action_description(action, reason)
-        }
-        base_result.update(kwargs)
-        return base_result
-
-    def _get_action_description(self, action: str, reason: str) -> str:
-        """Gibt beschreibenden Text für Aktionen zurück"""
-        descriptions = {
-            'close': 'Close entire position',
-            'partial_close': 'Close portion of position',
-            'update_stoploss': 'Update stop loss level',
-            'hold': 'Maintain current position',
-            'none': 'No action required'
-        }
-        return descriptions.get(action, 'Unknown action')
-
-    def _update_performance_metrics(self, action: str, reason: str):
-        """Aktualisiert Performance-Metriken mit detailliertem Tracking"""
-        if 'stop_loss' in reason:
-            self.performance_metrics['stop_loss_triggers'] += 1
-            self.performance_metrics['failed_trades'] += 1
-        elif 'target' in reason or 'tp' in reason.lower():
-            self.performance_metrics['take_profit_triggers'] += 1
-            self.performance_metrics['successful_trades'] += 1
-        elif 'emergency' in reason:
-            self.performance_metrics['emergency_stops'] += 1
-            self.performance_metrics['failed_trades'] += 1
-        elif 'partial_profit' in reason:
-            self.performance_metrics['partial_profit_taken'] += 1
-        elif 'duration' in reason:
-            self.performance_metrics['time_based_exits'] += 1
-
-    def get_performance_metrics(self) -> Dict[str, Any]:
-        """Gibt UM FASSENDE Performance-Metriken zurück"""
-        total_trades = self.performance_metrics['successful_trades'] + self.performance_metrics['failed_trades']
-        win_rate = (
-            (self.performance_metrics['successful_trades'] / total_trades * 100)
-            if total_trades > 0 else 0
-        )
-        
-        return {
-            **self.performance_metrics,
-            'total_trades_evaluated': self.performance_metrics['trades_evaluated'],
-            'win_rate_percent': round(win_rate, 2),
-            'active_trades_monitored': len(self.trade_history),
-            'volatility_cache_size': len(self.volatility_cache),
-            'breakeven_activated_count': len(self.breakeven_activated),
-            'trailing_stop_activated_count': len(self.trailing_stop_activated),
-            'system_uptime_hours': int((datetime.now() - self._get_start_time()).total_seconds() / 3600)
-        }
-
-    def _get_start_time(self) -> datetime:
-        """Gibt Startzeit des Risk Managers zurück"""
-        if not hasattr(self, '_start_time'):
-            self._start_time = datetime.now()
-        return self._start_time
-
-    def get_trade_recommendations(self, symbol: str) -> List[Dict[str, Any]]:
-        """Gibt spezifische Empfehlungen für einen Trade"""
-        try:
-            # Verwende aktuellen Preis für realistische Bewertung
-            from enhanced_binance_api import binance_api
-            current_price = binance_api.get_current_price(symbol)
-            result = self.evaluate_trade(symbol, current_price)
-            return result.get('recommendations', [])
-        except Exception as e:
-            logger.error(f"❌ Error getting trade recommendations for {symbol}: {e}")
-            return []
-
-    def reset_trade_state(self, symbol: str):
-        """Setzt den State für einen spezifischen Trade zurück"""
-        try:
-            if symbol in self.breakeven_activated:
-                self.breakeven_activated.remove(symbol)
-            if symbol in self.trailing_stop_activated:
-                self.trailing_stop_activated.remove(symbol)
-            if symbol in self.partial_profit_taken:
-                self.partial_profit_taken.remove(symbol)
-            if symbol in self.trade_history:
-                del self.trade_history[symbol]
-            
-            logger.info(f"🔄 Reset trade state for {symbol}")
-        except Exception as e:
-            logger.error(f"❌ Error resetting trade state for {symbol}: {e}")
-
-    def get_risk_parameters(self) -> Dict[str, Any]:
-        """Gibt aktuelle Risk Parameter zurück"""
-        return self.risk_parameters.copy()
-
-    def update_risk_parameters(self, new_parameters: Dict[str, Any]):
-        """Aktualisiert Risk Parameter mit Validierung"""
-        try:
-            for key, value in new_parameters.items():
-                if key in self.risk_parameters:
-                    # Validiere Werte
-                    if key.endswith('_activation') or key.endswith('_distance'):
-                        if 0 < value <= 0.5:  # Max 50%
-                            self.risk_parameters[key] = value
-                        else:
-                            logger.warning(f"⚠️ Invalid value for {key}: {value}")
-                    else:
-                        self.risk_parameters[key] = value
-            
-            logger.info("✅ Risk parameters updated successfully")
-        except Exception as e:
-            logger.error(f"❌ Error updating risk parameters: {e}")
-
-# Globale Instanz
+import json
+import logging
+import mmap
+import re
+import struct
+import time
+from collections import defaultdict, deque, namedtuple
+from functools import lru_cache
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple, Any
+from database import get_trade_db, get_all_active_trades_db, update_trade_status_db, set_trade_noActive_db, update_trade_amount_db
+
+logger = logging.getLogger(__name__)
+
+# orjson (Rust-Encoder, ~5x schneller als stdlib json) - optional
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Lazy gecachte API-Referenz: der Import läuft genau einmal beim ersten
+# Zugriff statt als IMPORT_NAME-Bytecode bei jedem Aufruf — und
+# risk_management bleibt ohne geladene Exchange-Anbindung importierbar
+_binance_api = None
+
+def _get_binance_api():
+    global _binance_api
+    if _binance_api is None:
+        from enhanced_binance_api import binance_api
+        _binance_api = binance_api
+    return _binance_api
+
+# Reine Float-Kernels auf Modul-Ebene: pos_sign (+1.0 für long, -1.0 für
+# short) ersetzt den String-Vergleich pro Aufruf; die Funktionen nehmen
+# nur Primitive und wären damit direkt JIT-/AOT-kompilierbar. Sollte der
+# Bot je eine Build-Pipeline bekommen, sind diese Kernels (plus die
+# Check-Kaskade in _evaluate_trade_data) die Kandidaten für eine
+# kompilierte risk_core-Extension — die Signaturen sind bewusst so
+# geschnitten, dass nur Doubles über die Grenze gehen
+def _pnl_kernel(entry: float, price: float, amount: float,
+                pos_sign: float, leverage: float) -> Tuple[float, float]:
+    diff = (price - entry) * pos_sign
+    return round(diff * amount, 2), round(diff / entry * 100.0 * leverage, 2)
+
+def _trailing_stop_kernel(price: float, entry: float, pos_sign: float,
+                          current_sl: float, distance: float) -> float:
+    if pos_sign > 0:
+        # Stop Loss nur nach oben anpassen, niemals nach unten
+        return max(price * (1 - distance), current_sl, entry * 0.99)
+    # Stop Loss nur nach unten anpassen, niemals nach oben
+    return min(price * (1 + distance), current_sl, entry * 1.01)
+
+# Volatilitäts-Tabelle auf Modul-Ebene: exakter Symbol-Lookup statt
+# linearem Substring-Scan pro Aufruf
+_VOLATILITY_TABLE = {
+    'BTCUSDT': 0.025, 'ETHUSDT': 0.030, 'BNBUSDT': 0.035,
+    'ADAUSDT': 0.045, 'DOTUSDT': 0.040, 'SOLUSDT': 0.050,
+    'XRPUSDT': 0.038, 'DOGEUSDT': 0.055, 'LTCUSDT': 0.032,
+}
+_VOLATILITY_DEFAULT = 0.035
+
+# Substring-Fallback als kompilierte Regex-Alternation: ein C-Match über
+# alle Tabellen-Keys statt einer Python-Schleife pro Symbol (längste
+# Keys zuerst, damit der spezifischste Treffer gewinnt)
+_VOLATILITY_RE = re.compile(
+    '|'.join(map(re.escape, sorted(_VOLATILITY_TABLE, key=len, reverse=True)))
+)
+# Obergrenze für den Volatilitäts-Cache — ein Eintrag pro jemals
+# gesehenem Symbol würde sonst unbegrenzt wachsen
+_VOLATILITY_CACHE_MAX = 256
+
+# Einmal entpackte Trade-Zeile für die Check-Kaskade: Attribut-Zugriff
+# auf ein namedtuple statt wiederholter Dict-Lookups in jedem Check
+TradeRow = namedtuple(
+    'TradeRow',
+    'entry pos amount sl tk1 tk2 tk3 tk4 status lev created'
+)
+
+# Take-Profit-Konfiguration als Modul-Konstanten: Status → Target-Index
+# plus parallel indizierte Action-/Beschreibungs-Tupel, statt das
+# verschachtelte Dict-Literal pro Aufruf neu aufzubauen
+_STATUS_IDX = {'NEW': 0, 'FILLED': 0, 'TK1': 1, 'TK2': 2, 'TK3': 3}
+_STATUS_ACTION = ('tk1', 'tk2', 'tk3', 'close_tp4')
+_STATUS_DESC = ('First Target', 'Second Target', 'Third Target', 'Final Target')
+
+# Reason-Schlüsselwort → (Zähler, Outcome-Zähler) für die Performance-
+# Metriken; Reihenfolge entspricht der alten if/elif-Kette, der erste
+# Treffer gewinnt
+_REASON_MAP = {
+    'stop_loss': ('stop_loss_triggers', 'failed_trades'),
+    'target': ('take_profit_triggers', 'successful_trades'),
+    'tp': ('take_profit_triggers', 'successful_trades'),
+    'emergency': ('emergency_stops', 'failed_trades'),
+    'partial_profit': ('partial_profit_taken', None),
+    'duration': ('time_based_exits', None),
+}
+
+@lru_cache(maxsize=64)
+def _classify_reason(reason_lower: str) -> Tuple[Optional[str], Optional[str]]:
+    """Klassifiziert einen Reason-String in (Zähler, Outcome-Zähler).
+
+    Die Menge der Reason-Strings ist klein und ändert sich nie — der
+    lru_cache sättigt also schnell und ersetzt die Substring-Scans durch
+    einen einzigen Hash-Lookup pro wiederholtem Trigger.
+    """
+    for keyword, pair in _REASON_MAP.items():
+        if keyword in reason_lower:
+            return pair
+    return (None, None)
+
+class _Metrics:
+    """Performance-Zähler als __slots__-Klasse statt String-Dict.
+
+    Jedes Inkrement ist damit ein direkter Slot-Zugriff (C-Array) statt
+    String-Hash + Dict-Lookup; das Dict-Format für Dashboards liefert
+    as_dict() weiterhin mit denselben Schlüsseln.
+    """
+    __slots__ = (
+        'trades_evaluated', 'stop_loss_triggers', 'take_profit_triggers',
+        'trailing_stop_activations', 'breakeven_activations',
+        'partial_profit_taken', 'emergency_stops', 'time_based_exits',
+        'total_pnl', 'successful_trades', 'failed_trades'
+    )
+
+    def __init__(self):
+        for slot in self.__slots__:
+            setattr(self, slot, 0)
+        self.total_pnl = 0.0
+
+    def as_tuple(self) -> tuple:
+        """Werte als Tupel — dient als Cache-Key für die Metrik-Sicht"""
+        return tuple(getattr(self, slot) for slot in self.__slots__)
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Werte im alten Dict-Format für Dashboards/Reports"""
+        return {slot: getattr(self, slot) for slot in self.__slots__}
+
+
+# Spiegel-Datei für externe Scraper: 11 Felder in Slot-Reihenfolge von
+# _Metrics, little-endian, 8 Byte je Feld (total_pnl als Double) — ein
+# Exporter-Prozess mappt die Datei und liest ohne IPC oder Python-Aufruf
+_METRICS_MMAP_FILE = 'risk_metrics.bin'
+_METRICS_STRUCT = struct.Struct('<8qd2q')
+
+
+# Expliziter Validator pro Risk-Parameter: ein Dict-Lookup statt zweier
+# endswith-Scans pro Key beim Update; unbekannte Keys fallen wie bisher
+# still durch
+_PARAM_VALIDATORS = {
+    'max_drawdown_per_trade': lambda v: v > 0,
+    'trailing_stop_activation': lambda v: 0 < v <= 0.5,
+    'trailing_stop_distance': lambda v: 0 < v <= 0.5,
+    'breakeven_activation': lambda v: 0 < v <= 0.5,
+    'volatility_multiplier': lambda v: v > 0,
+    'max_trade_duration_hours': lambda v: v > 0,
+    'partial_profit_activation': lambda v: 0 < v <= 0.5,
+    'emergency_stop_activation': lambda v: 0 < v <= 0.5,
+}
+
+# Bits für den Risk-Management-State pro Symbol (ein Bitmask-Dict statt
+# drei getrennter Sets → ein Hash-Lookup pro Check)
+_STATE_BREAKEVEN = 1
+_STATE_TRAILING = 2
+_STATE_PARTIAL = 4
+
+def _risk_reward_kernel(entry: float, stop_loss: float,
+                        take_profit: float, pos_sign: float) -> float:
+    risk = (entry - stop_loss) * pos_sign
+    reward = (take_profit - entry) * pos_sign
+    if risk > 0:
+        return round(reward / risk, 2)
+    return 1.0
+
+class AdvancedRiskManager:
+    def __init__(self):
+        # PROFESSIONELLE Take Profit Level Konfiguration
+        self.take_profit_levels = {
+            'TK1': {'close_percentage': 0.5, 'move_sl_to_entry': True, 'description': 'First Profit Take'},
+            'TK2': {'close_percentage': 0.3, 'move_sl_to_tk1': True, 'description': 'Second Profit Take'},
+            'TK3': {'close_percentage': 0.2, 'move_sl_to_tk2': True, 'description': 'Third Profit Take'}
+        }
+        
+        # ERWEITERTE Risk Parameter mit dynamischen Anpassungen
+        self.risk_parameters = {
+            'max_drawdown_per_trade': 0.02,           # 2% max loss per trade
+            'trailing_stop_activation': 0.05,         # 5% profit activates trailing stop
+            'trailing_stop_distance': 0.02,           # 2% trailing distance
+            'breakeven_activation': 0.03,             # 3% profit activates breakeven
+            'volatility_multiplier': 1.5,             # Multiplier for volatile markets
+            'max_trade_duration_hours': 168,          # 7 days maximum trade duration
+            'partial_profit_activation': 0.10,        # 10% profit for partial profit taking
+            'emergency_stop_activation': 0.15,        # 15% loss triggers emergency stop
+        }
+
+        # Abgeleitete Schwellwerte einmal vorrechnen statt pro Tick
+        # (Dict-Lookups + Multiplikation in jedem Check)
+        self._refresh_derived_thresholds()
+
+        # UM FASSENDE Performance Tracking (Slot-Zugriffe statt Dict)
+        self.performance_metrics = _Metrics()
+
+        # Win-Rate inkrementell am Schreibpfad gepflegt statt bei jedem
+        # Metrik-Read neu dividiert
+        self._win_rate = 0.0
+        
+        # Dynamische Trade-Historie für erweiterte Analyse: drei parallele
+        # Ring-Puffer (Spalten-Layout, SoA) pro Symbol statt einer
+        # Tupel-Liste — so läuft das Rolling-High/Low über die reine
+        # Preis-Spalte als einzelner max()/min()-C-Durchlauf. Das
+        # Spalten-Layout ist bewusst so gewählt, dass die Puffer bei
+        # Bedarf 1:1 durch flache Arrays ersetzbar wären (ein Vektor-
+        # Vergleich über alle offenen Trades statt einer Schleife);
+        # portfolio-weite Sweeps laufen bis dahin über
+        # evaluate_trades_batch mit EINER DB-Query und dem
+        # _last_eval-Kurzschluss pro Symbol
+        self._hist_ts = defaultdict(lambda: deque(maxlen=100))
+        self._hist_price = defaultdict(lambda: deque(maxlen=100))
+        self._hist_sl = defaultdict(lambda: deque(maxlen=100))
+        self.volatility_cache = {}
+        self.market_conditions = {}
+        
+        # Risk Management State: Symbol → Bitmaske (_STATE_BREAKEVEN,
+        # _STATE_TRAILING, _STATE_PARTIAL)
+        self._state = defaultdict(int)
+
+        # Kurzschluss-Cache pro Symbol: solange sich die DB-Zeile nicht
+        # geändert hat und der Preis keine Schwelle gekreuzt hat, kann die
+        # letzte 'hold'-Bewertung wiederverwendet werden
+        self._last_eval = {}
+
+        # Letzter gesehener Preis pro Symbol (Preis, monotonic-Zeit):
+        # wird vom Evaluierungs-Pfad gefüttert, damit z.B.
+        # get_trade_recommendations ohne REST-Roundtrip auskommt
+        self._price_cache = {}
+
+        # Startzeit als monotone Uhr (Nanosekunden-Integer) — Uptime
+        # braucht keine Wanduhr, kein datetime-Objekt und keinen
+        # Float-Pfad pro Abfrage
+        self._start_ns = time.monotonic_ns()
+
+        # Memoisierte Metrik-Sicht für Dashboard-Polls; der Key bündelt
+        # alle Eingänge, _state_epoch zählt Bitmask-Mutationen
+        self._state_epoch = 0
+        self._metrics_cache = None
+        self._metrics_cache_key = None
+
+        # mmap-Spiegel der Zähler (lazy beim ersten Snapshot geöffnet)
+        self._metrics_mmap = None
+
+        # JSON-Sicht des Snapshots, gecached pro Snapshot-Identität
+        self._metrics_json = None
+        self._metrics_json_src = None
+
+    def _refresh_derived_thresholds(self):
+        """Rechnet die Prozent-Schwellwerte aus den Risk-Parametern vor"""
+        params = self.risk_parameters
+        self._emergency_thr_pct = -params['emergency_stop_activation'] * 100
+        self._trailing_activation_pct = params['trailing_stop_activation'] * 100
+        self._breakeven_thr_pct = params['breakeven_activation'] * 100
+        self._partial_thr_pct = params['partial_profit_activation'] * 100
+        self._max_duration_h = params['max_trade_duration_hours']
+
+    def evaluate_trade(self, symbol: str, current_price: float) -> Dict[str, Any]:
+        """Evaluierte einen Trade mit PROFESSIONELLEM Risk Management"""
+        # Hole Trade-Daten mit robustem Error Handling
+        trade_data = get_trade_db(symbol)
+        if not trade_data:
+            logger.warning("⚠️ No trade data found for %s", symbol)
+            self.performance_metrics.trades_evaluated += 1
+            return self._create_result('none', 'no_trade_found')
+
+        return self._evaluate_trade_data(symbol, current_price, trade_data)
+
+    def evaluate_trades_batch(self, current_prices: Dict[str, float]) -> Dict[str, Dict[str, Any]]:
+        """Evaluiert mehrere Trades mit EINER DB-Query statt einer pro Symbol.
+
+        current_prices: Mapping Symbol -> aktueller Preis.
+        """
+        results = {}
+        try:
+            all_trades = get_all_active_trades_db()
+        except Exception as e:
+            logger.error("❌ Error loading trades for batch evaluation: %s", e)
+            all_trades = {}
+
+        # Lokale Bindungen: spart die Attribut-Lookups pro Schleifendurchlauf
+        get_trade = all_trades.get
+        evaluate = self._evaluate_trade_data
+        metrics = self.performance_metrics
+
+        for symbol, current_price in current_prices.items():
+            trade_data = get_trade(symbol.upper())
+            if not trade_data:
+                logger.warning("⚠️ No trade data found for %s", symbol)
+                metrics.trades_evaluated += 1
+                results[symbol] = self._create_result('none', 'no_trade_found')
+                continue
+            results[symbol] = evaluate(symbol, current_price, trade_data)
+
+        return results
+
+    def _evaluate_trade_data(self, symbol: str, current_price: float, trade_data: Dict) -> Dict[str, Any]:
+        """Kern der Trade-Evaluierung für bereits geladene Trade-Daten"""
+        try:
+            # Kurzschluss: unveränderte DB-Zeile + keine gekreuzte Schwelle
+            # seit dem letzten Tick → letzte 'hold'-Bewertung mit frischem
+            # Preis/PnL zurückgeben statt die volle Check-Kaskade zu fahren
+            # Tick-Preis für spätere Nachschläge merken (Dict-Write ist
+            # billiger als jeder REST-Roundtrip zum Nachholen)
+            self._price_cache[symbol] = (current_price, time.monotonic())
+
+            # Bei aktivem Trailing Stop NIE den Kurzschluss nehmen: jedes
+            # neue Hoch/Tief innerhalb des Schwellen-Bands muss den SL
+            # nachziehen können, eine gecachte 'hold'-Bewertung würde den
+            # Ratchet unterdrücken
+            cached = (None if self._state.get(symbol, 0) & _STATE_TRAILING
+                      else self._last_eval.get(symbol))
+            if cached is not None:
+                c_updated, c_price, c_mono, c_result, c_thresholds = cached
+                if (trade_data.get('updated_at') == c_updated
+                        and time.monotonic() - c_mono < 30.0):
+                    lo, hi = ((c_price, current_price)
+                              if c_price <= current_price
+                              else (current_price, c_price))
+                    if not any(lo <= t <= hi for t in c_thresholds):
+                        self.performance_metrics.trades_evaluated += 1
+                        pos_sign = 1.0 if c_result['position'] == 'long' else -1.0
+                        pnl, pnl_pct = _pnl_kernel(
+                            c_result['entry_price'], current_price,
+                            trade_data.get('quantity', 0), pos_sign,
+                            c_result['leverage']
+                        )
+                        fresh = dict(c_result)
+                        fresh['current_price'] = current_price
+                        fresh['current_pnl'] = pnl
+                        fresh['pnl_percentage'] = pnl_pct
+                        return fresh
+
+            self.performance_metrics.trades_evaluated += 1
+
+            # Wanduhr EINMAL pro Evaluierung lesen statt 4+ Syscalls
+            now = datetime.now()
+            now_iso = now.isoformat()
+
+            # ROBUSTE Dictionary-Zugriffe mit Fallbacks
+            entry_price = trade_data.get('entry_price', 0)
+            position = trade_data.get('position', 'LONG').lower()
+            amount = trade_data.get('quantity', 0)
+            stop_loss = trade_data.get('stop_loss', 0)
+            tk1 = trade_data.get('take_profit_1', 0)
+            tk2 = trade_data.get('take_profit_2', 0)
+            tk3 = trade_data.get('take_profit_3', 0)
+            tk4 = trade_data.get('take_profit_4', 0)
+            status = trade_data.get('status', 'NEW')
+            leverage = trade_data.get('leverage', 1)
+            created_at = trade_data.get('created_at', now)
+
+            # Validiere kritische Daten
+            if entry_price <= 0:
+                logger.error("❌ Invalid entry price for %s: %s", symbol, entry_price)
+                return self._create_result('none', 'invalid_trade_data', timestamp_iso=now_iso)
+
+            # Einmal entpackt für alle Checks: Attribut-Zugriff statt
+            # erneuter Dict-Lookups pro Check
+            row = TradeRow(entry_price, position, amount, stop_loss,
+                           tk1, tk2, tk3, tk4, status, leverage, created_at)
+
+            # Berechne aktuelle Performance
+            current_pnl, pnl_percentage = self._calculate_pnl(
+                entry_price, current_price, amount, position, leverage
+            )
+            
+            # Erstelle Result-Objekt — zunächst nur mit den Feldern, die
+            # die Checks tatsächlich lesen; Analyse-Werte (R/R, Volatilität,
+            # Confidence, Dauer) werden erst berechnet, wenn sie gebraucht
+            # werden, statt auf dem Emergency-/SL-Pfad umsonst
+            result = {
+                'symbol': symbol,
+                'current_price': current_price,
+                'entry_price': entry_price,
+                'position': position,
+                'status': status,
+                'current_pnl': current_pnl,
+                'pnl_percentage': pnl_percentage,
+                'leverage': leverage,
+                'action': 'hold',
+                'reason': '',
+                'recommendations': [],
+                'timestamp': now_iso
+            }
+            
+            # Führe PROFESSIONELLE Risk Management Checks durch — als
+            # flache Kaskade in Prioritäts-Reihenfolge statt Liste+Loop;
+            # die Checks selbst fangen ihre Fehler und pflegen die Metriken
+            if (r := self._check_emergency_stop(result, row)) is not None:
+                result.update(r)
+                return result
+            if (r := self._check_stop_loss(result, row)) is not None:
+                result.update(r)
+                return result
+            if (r := self._check_take_profits(result, row)) is not None:
+                result.update(r)
+                return result
+            if (r := self._check_trailing_stop(result, row)) is not None:
+                result.update(r)
+                return result
+            if (r := self._check_breakeven(result, row)) is not None:
+                result.update(r)
+                return result
+            if (r := self._check_partial_profit(result, row)) is not None:
+                result.update(r)
+                return result
+            result['trade_duration'] = self._calculate_trade_duration(created_at, now)
+            if (r := self._check_time_based_exit(result, row)) is not None:
+                result.update(r)
+                return result
+
+            # Ab hier steht 'hold' fest — jetzt die Analyse-Felder für
+            # Empfehlungen, Status-Log und Aufrufer nachziehen
+            result['risk_reward_ratio'] = self._calculate_risk_reward_ratio(entry_price, stop_loss, tk1, position)
+            result['volatility_level'] = self._calculate_volatility(symbol, now)
+            result['confidence_score'] = self._calculate_confidence_score(current_pnl, pnl_percentage)
+
+            self._check_volatility_adjustment(result, row)
+
+            # Generiere proaktive Empfehlungen
+            result['recommendations'] = self._generate_recommendations(result, row)
+
+            # Logge Trade-Status bei signifikanten Ereignissen
+            self._log_trade_status(result)
+
+            # 'hold'-Bewertung für den Kurzschluss-Pfad cachen: alle
+            # Preisniveaus, deren Kreuzung eine andere Aktion auslösen
+            # könnte (SL/TKs plus die PnL-Prozent-Schwellen in Preis
+            # umgerechnet, beide Richtungen)
+            per_pct = entry_price / (100.0 * leverage) if leverage else 0.0
+            thresholds = [t for t in (stop_loss, tk1, tk2, tk3, tk4) if t]
+            if stop_loss > 0:
+                # Der Stop Loss feuert am GEPUFFERTEN Niveau (Volatilität
+                # + Slippage), nicht am Rohwert — beide Richtungen ablegen,
+                # damit der Kurzschluss den Trigger nie überspringt
+                sl_buffer = self._get_volatility_buffer(symbol, entry_price) + 0.001
+                thresholds.append(stop_loss * (1 - sl_buffer))
+                thresholds.append(stop_loss * (1 + sl_buffer))
+            for pct in (self._emergency_thr_pct, self._trailing_activation_pct,
+                        self._breakeven_thr_pct, self._partial_thr_pct):
+                thresholds.append(entry_price + pct * per_pct)
+                thresholds.append(entry_price - pct * per_pct)
+            self._last_eval[symbol] = (
+                trade_data.get('updated_at'), current_price,
+                time.monotonic(), result, tuple(thresholds)
+            )
+
+            return result
+                
+        except Exception as e:
+            logger.error("❌ Critical error evaluating trade %s: %s", symbol, e)
+            return self._create_result('none', f'evaluation_error: {str(e)}')
+
+    def _calculate_pnl(self, entry_price: float, current_price: float, 
+                      amount: float, position: str, leverage: float) -> Tuple[float, float]:
+        """Berechnet PnL mit Leverage-Berücksichtigung und Rounding"""
+        try:
+            pos_sign = 1.0 if position == 'long' else -1.0
+            return _pnl_kernel(entry_price, current_price, amount, pos_sign, leverage)
+        except Exception as e:
+            logger.error("❌ Error calculating PnL: %s", e)
+            return 0.0, 0.0
+
+    def _calculate_trade_duration(self, created_at: datetime,
+                                  now: Optional[datetime] = None) -> int:
+        """Berechnet Trade-Dauer in Stunden.
+
+        created_at kommt aus der DB-Schicht bereits als datetime —
+        _normalize_trade_row parst die ISO-Strings einmal beim Fetch,
+        nicht mehr hier pro Tick.
+        """
+        try:
+            duration = (now or datetime.now()) - created_at
+            return int(duration.total_seconds() / 3600)  # Stunden
+        except:
+            return 0
+
+    def _calculate_risk_reward_ratio(self, entry: float, stop_loss: float, take_profit: float, position: str) -> float:
+        """Berechnet Risk/Reward Ratio"""
+        try:
+            pos_sign = 1.0 if position == 'long' else -1.0
+            return _risk_reward_kernel(entry, stop_loss, take_profit, pos_sign)
+        except:
+            return 1.0
+
+    def _calculate_confidence_score(self, pnl: float, pnl_percentage: float) -> float:
+        """Berechnet Confidence Score basierend auf Performance"""
+        try:
+            base_score = 50.0  # Neutral starting point
+            
+            # PnL-basierte Anpassung
+            if pnl > 0:
+                base_score += min(pnl_percentage * 2, 30)  # Max +30 für Profit
+            else:
+                base_score -= min(abs(pnl_percentage), 20)  # Max -20 für Loss
+            
+            return max(10.0, min(100.0, base_score))  # Clamp between 10-100
+        except:
+            return 50.0
+
+    def _check_emergency_stop(self, result: Dict, row: TradeRow) -> Optional[Dict]:
+        """Notfall-Stop bei extremen Verlusten"""
+        try:
+            pnl_percentage = result['pnl_percentage']
+            
+            if pnl_percentage <= self._emergency_thr_pct:
+                logger.warning("🚨 EMERGENCY STOP triggered for %s: %.2f%%", result['symbol'], pnl_percentage)
+                self._update_performance_metrics('close', 'emergency_stop_triggered')
+                return self._create_result('close', 'emergency_stop_triggered')
+            
+            return None
+        except Exception as e:
+            logger.error("❌ Error in emergency stop check: %s", e)
+            return None
+
+    def _check_stop_loss(self, result: Dict, row: TradeRow) -> Optional[Dict]:
+        """Überprüft Stop Loss mit Volatilitäts-Puffer und Slippage-Berücksichtigung"""
+        try:
+            position = result['position']
+            current_price = result['current_price']
+            stop_loss = row.sl
+            entry_price = result['entry_price']
+            
+            if stop_loss <= 0:
+                return None
+            
+            # Berechne dynamischen Volatilitäts-Puffer
+            volatility_buffer = self._get_volatility_buffer(result['symbol'], entry_price)
+            
+            # Füge Slippage-Buffer hinzu
+            slippage_buffer = 0.001  # 0.1% Slippage Protection
+            
+            total_buffer = volatility_buffer + slippage_buffer
+            
+            if position == 'long':
+                # Für Long: Preis fällt unter Stop Loss mit Buffer
+                if current_price <= stop_loss * (1 - total_buffer):
+                    logger.info("🛑 Stop Loss triggered for %s at %.2f", result['symbol'], current_price)
+                    self._update_performance_metrics('close', 'stop_loss_triggered')
+                    return self._create_result('close', 'stop_loss_triggered')
+            else:
+                # Für Short: Preis steigt über Stop Loss mit Buffer
+                if current_price >= stop_loss * (1 + total_buffer):
+                    logger.info("🛑 Stop Loss triggered for %s at %.2f", result['symbol'], current_price)
+                    self._update_performance_metrics('close', 'stop_loss_triggered')
+                    return self._create_result('close', 'stop_loss_triggered')
+            
+            return None
+        except Exception as e:
+            logger.error("❌ Error in stop loss check: %s", e)
+            return None
+
+    def _check_take_profits(self, result: Dict, row: TradeRow) -> Optional[Dict]:
+        """Überprüft Take Profit Levels mit ROBUSTEM Error Handling"""
+        try:
+            position = result['position']
+            current_price = result['current_price']
+            status = result['status']
+            
+            # Status → Target-Index über die Modul-Tabellen
+            target_index = _STATUS_IDX.get(status)
+            if target_index is None:
+                return None
+
+            # Direkt indizieren statt eine gefilterte Liste zu bauen —
+            # das frühere valid_targets-Filtern verschob bei Lücken die
+            # Indizes und prüfte dann das falsche Target (tk1..tk4 liegen
+            # im TradeRow an Position 4..7)
+            target_price = row[4 + target_index]
+            if not target_price or target_price <= 0:
+                return None
+
+            # Überprüfe ob Target erreicht wurde
+            condition_met = (
+                (position == 'long' and current_price >= target_price) or
+                (position == 'short' and current_price <= target_price)
+            )
+
+            if condition_met:
+                action = _STATUS_ACTION[target_index]
+                description = _STATUS_DESC[target_index]
+                if action == 'close_tp4':
+                    logger.info("🎯 Final Target reached for %s at %.2f", result['symbol'], current_price)
+                    self._update_performance_metrics('close', 'target_4_reached')
+                    return self._create_result('close', 'target_4_reached')
+                tp_settings = self.take_profit_levels.get(action.upper(),
+                                                        {'close_percentage': 0.5, 'move_sl_to_entry': True})
+                logger.info("🎯 %s reached for %s", description, result['symbol'])
+                self._update_performance_metrics('partial_close', f'{action}_reached')
+                return {
+                    'action': 'partial_close',
+                    'reason': f'{action}_reached',
+                    'close_percentage': tp_settings['close_percentage'],
+                    'new_status': action.upper(),
+                    'move_stoploss': tp_settings.get('move_sl_to_entry', False),
+                    'description': description
+                }
+
+            return None
+        except Exception as e:
+            logger.error("❌ Error in take profit check for %s: %s", result.get('symbol', 'unknown'), e)
+            return None
+
+    def _check_trailing_stop(self, result: Dict, row: TradeRow) -> Optional[Dict]:
+        """Überprüft und aktualisiert Trailing Stop mit dynamischer Distanz"""
+        try:
+            symbol = result['symbol']
+            current_price = result['current_price']
+            position = result['position']
+            pnl_percentage = result['pnl_percentage']
+            
+            # Aktiviere Trailing Stop nur bei ausreichendem Profit
+            if abs(pnl_percentage) < self._trailing_activation_pct:
+                return None
+            
+            # Dynamische Trailing Stop Distanz basierend auf Volatilität
+            volatility = self._calculate_volatility(symbol)
+            dynamic_distance = max(
+                self.risk_parameters['trailing_stop_distance'],
+                volatility * 0.8  # 80% der Volatilität als Mindestabstand
+            )
+            
+            current_sl = row.sl
+
+            # Füge aktuellen Preis zur Historie hinzu (monotone Uhr reicht
+            # hier und ist billiger als datetime.now()); die deques werfen
+            # alte Einträge ab maxlen automatisch raus
+            prices = self._hist_price[symbol]
+            prices.append(current_price)
+            self._hist_ts[symbol].append(time.monotonic())
+            self._hist_sl[symbol].append(current_sl)
+
+            # Chandelier-Style: Trailing auf der High-/Low-Wassermarke der
+            # Historie statt nur auf dem letzten Tick
+            extreme_price = max(prices) if position == 'long' else min(prices)
+
+            # Berechne optimalen Trailing Stop
+            new_stop_loss = self._calculate_trailing_stop(
+                symbol, extreme_price, result['entry_price'], position, current_sl, dynamic_distance
+            )
+            
+            if new_stop_loss != current_sl:
+                logger.info("🔄 Trailing stop updated for %s: %.2f → %.2f", symbol, current_sl, new_stop_loss)
+                self._state[symbol] |= _STATE_TRAILING
+                self._state_epoch += 1
+                self.performance_metrics.trailing_stop_activations += 1
+                self._update_performance_metrics('update_stoploss', 'trailing_stop_updated')
+                return self._create_result('update_stoploss', 'trailing_stop_updated')
+            
+            return None
+        except Exception as e:
+            logger.error("❌ Error in trailing stop check: %s", e)
+            return None
+
+    def _calculate_trailing_stop(self, symbol: str, current_price: float, 
+                               entry_price: float, position: str, current_sl: float, distance: float) -> float:
+        """Berechnet neuen Trailing Stop Preis mit dynamischer Logik"""
+        try:
+            pos_sign = 1.0 if position == 'long' else -1.0
+            return _trailing_stop_kernel(current_price, entry_price, pos_sign, current_sl, distance)
+        except Exception as e:
+            logger.error("❌ Error calculating trailing stop: %s", e)
+            return current_sl
+
+    def _check_breakeven(self, result: Dict, row: TradeRow) -> Optional[Dict]:
+        """Aktiviert Breakeven Stop Loss mit Progressivem Approach"""
+        try:
+            symbol = result['symbol']
+            position = result['position']
+            current_price = result['current_price']
+            entry_price = result['entry_price']
+            pnl_percentage = result['pnl_percentage']
+            current_sl = row.sl
+            
+            # Prüfe ob Breakeven bereits aktiviert wurde
+            if self._state[symbol] & _STATE_BREAKEVEN:
+                return None
+            
+            # Aktiviere Breakeven bei ausreichendem Profit
+            if abs(pnl_percentage) >= self._breakeven_thr_pct:
+                if position == 'long':
+                    new_sl = entry_price * 1.001  # Leicht über Entry für Puffer
+                else:
+                    new_sl = entry_price * 0.999  # Leicht unter Entry für Puffer
+                
+                if ((position == 'long' and new_sl > current_sl) or 
+                    (position == 'short' and new_sl < current_sl)):
+                    
+                    self._state[symbol] |= _STATE_BREAKEVEN
+                    self._state_epoch += 1
+                    self.performance_metrics.breakeven_activations += 1
+                    logger.info("⚖️ Breakeven activated for %s at %.2f", symbol, new_sl)
+                    self._update_performance_metrics('update_stoploss', 'breakeven_activated')
+                    return self._create_result('update_stoploss', 'breakeven_activated')
+            
+            return None
+        except Exception as e:
+            logger.error("❌ Error in breakeven check: %s", e)
+            return None
+
+    def _check_partial_profit(self, result: Dict, row: TradeRow) -> Optional[Dict]:
+        """Proaktive Teilgewinn-Mitnahme bei hohem Profit"""
+        try:
+            symbol = result['symbol']
+            pnl_percentage = result['pnl_percentage']
+            
+            # Vermeide mehrfache Teilgewinn-Mitnahme
+            if self._state[symbol] & _STATE_PARTIAL:
+                return None
+            
+            # Aktiviere Teilgewinn-Mitnahme bei sehr hohem Profit
+            if pnl_percentage >= self._partial_thr_pct:
+                self._state[symbol] |= _STATE_PARTIAL
+                self._state_epoch += 1
+                self.performance_metrics.partial_profit_taken += 1
+                logger.info("💰 Partial profit taken for %s at %.2f%%", symbol, pnl_percentage)
+                self._update_performance_metrics('partial_close', 'partial_profit_taken')
+                return {
+                    'action': 'partial_close',
+                    'reason': 'partial_profit_taken',
+                    'close_percentage': 0.25,  # 25% der Position
+                    'new_status': result['status'],  # Status bleibt gleich
+                    'description': 'Proactive partial profit taking'
+                }
+            
+            return None
+        except Exception as e:
+            logger.error("❌ Error in partial profit check: %s", e)
+            return None
+
+    def _check_time_based_exit(self, result: Dict, row: TradeRow) -> Optional[Dict]:
+        """Time-based Exit nach maximaler Haltedauer"""
+        try:
+            trade_duration_hours = result.get('trade_duration', 0)
+
+            if trade_duration_hours >= self._max_duration_h:
+                logger.info("⏰ Time-based exit for %s after %sh", result['symbol'], trade_duration_hours)
+                self.performance_metrics.time_based_exits += 1
+                self._update_performance_metrics('close', 'max_trade_duration_reached')
+                return self._create_result('close', 'max_trade_duration_reached')
+            
+            return None
+        except Exception as e:
+            logger.error("❌ Error in time based exit check: %s", e)
+            return None
+
+    def _check_volatility_adjustment(self, result: Dict, row: TradeRow) -> Optional[Dict]:
+        """Passt Risk-Parameter basierend auf Marktvolatilität an"""
+        try:
+            symbol = result['symbol']
+            current_volatility = result.get('volatility_level', 0.03)
+            
+            # Generiere Volatilitäts-basierte Empfehlungen
+            if current_volatility > 0.08:  # Sehr hohe Volatilität
+                result['recommendations'].append({
+                    'type': 'high_volatility_warning',
+                    'message': f'Very high volatility detected: {current_volatility:.2%}',
+                    'suggestion': 'Consider reducing position size or widening stop loss',
+                    'priority': 'high'
+                })
+            elif current_volatility > 0.05:  # Hohe Volatilität
+                result['recommendations'].append({
+                    'type': 'volatility_advisory',
+                    'message': f'High volatility detected: {current_volatility:.2%}',
+                    'suggestion': 'Monitor trade closely and consider tighter risk management',
+                    'priority': 'medium'
+                })
+            
+            return None
+        except Exception as e:
+            logger.error("❌ Error in volatility adjustment: %s", e)
+            return None
+
+    def _get_volatility_buffer(self, symbol: str, price: float) -> float:
+        """Berechnet dynamischen Volatilitäts-Puffer für Stop Loss"""
+        try:
+            volatility = self._calculate_volatility(symbol)
+            # Puffer ist 1.5x Volatilität, aber maximal 3%
+            buffer = min(volatility * self.risk_parameters['volatility_multiplier'], 0.03)
+            return max(buffer, 0.005)  # Mindestens 0.5% Buffer
+        except:
+            return 0.01  # Default 1% Buffer
+
+    def _calculate_volatility(self, symbol: str, now: Optional[datetime] = None) -> float:
+        """Berechnet die Volatilität eines Symbols mit erweiterter Logik"""
+        try:
+            if now is None:
+                now = datetime.now()
+
+            # Cache für 10 Minuten
+            if symbol in self.volatility_cache:
+                cache_time, volatility = self.volatility_cache[symbol]
+                if (now - cache_time).total_seconds() < 600:
+                    return volatility
+            
+            # Realisierte Volatilität aus der Preis-Historie, falls genug
+            # Ticks vorliegen; sonst exakter Dict-Lookup (O(1) für den
+            # Normalfall) mit Substring-Fallback für abweichende
+            # Schreibweisen
+            volatility = self._realized_volatility(symbol)
+            if volatility is None:
+                volatility = _VOLATILITY_TABLE.get(symbol)
+            if volatility is None:
+                match = _VOLATILITY_RE.search(symbol)
+                volatility = (_VOLATILITY_TABLE[match.group(0)]
+                              if match else _VOLATILITY_DEFAULT)
+
+            # Aktualisiere Cache; bei Erreichen der Obergrenze fliegt der
+            # älteste Eintrag raus (Insertion-Order des Dicts)
+            cache = self.volatility_cache
+            if symbol not in cache and len(cache) >= _VOLATILITY_CACHE_MAX:
+                cache.pop(next(iter(cache)))
+            cache[symbol] = (now, volatility)
+            
+            return volatility
+            
+        except Exception as e:
+            logger.error("❌ Error calculating volatility for %s: %s", symbol, e)
+            return 0.03  # Default volatility
+
+    def _realized_volatility(self, symbol: str) -> Optional[float]:
+        """Realisierte Volatilität aus dem Preis-Ringpuffer eines Symbols.
+
+        Summe und Quadratsumme der Tick-Returns werden in EINEM Durchlauf
+        über die Deque akkumuliert (keine Zwischenlisten) — das entspricht
+        der Standardabweichung der Returns über das Fenster. Liefert None,
+        wenn zu wenig Historie vorliegt; dann greift die statische Tabelle.
+        """
+        try:
+            prices = self._hist_price.get(symbol)
+            if prices is None or len(prices) < 10:
+                return None
+
+            ret_sum = 0.0
+            ret_sq = 0.0
+            n = 0
+            prev = None
+            for price in prices:
+                if prev is not None and prev > 0:
+                    ret = (price - prev) / prev
+                    ret_sum += ret
+                    ret_sq += ret * ret
+                    n += 1
+                prev = price
+
+            if n < 2:
+                return None
+            mean = ret_sum / n
+            variance = ret_sq / n - mean * mean
+            return variance ** 0.5 if variance > 0 else None
+        except Exception as e:
+            logger.error("❌ Error computing realized volatility for %s: %s", symbol, e)
+            return None
+
+    def _generate_recommendations(self, result: Dict, row: TradeRow) -> List[Dict]:
+        """Generiert PROFESSIONELLE Handlungsempfehlungen"""
+        recommendations = []
+        
+        # Profit-basierte Empfehlungen
+        pnl_percentage = result['pnl_percentage']
+        
+        if pnl_percentage > 20:
+            recommendations.append({
+                'type': 'excellent_profit',
+                'message': f'Exceptional profit achieved: {pnl_percentage:.2f}%',
+                'suggestion': 'Consider taking significant profits or moving stop loss to lock in gains',
+                'priority': 'high'
+            })
+        elif pnl_percentage > 10:
+            recommendations.append({
+                'type': 'good_profit',
+                'message': f'Strong profit achieved: {pnl_percentage:.2f}%',
+                'suggestion': 'Consider partial profit taking or trailing stop activation',
+                'priority': 'medium'
+            })
+        elif pnl_percentage < -8:
+            recommendations.append({
+                'type': 'significant_drawdown',
+                'message': f'Significant drawdown: {pnl_percentage:.2f}%',
+                'suggestion': 'Monitor stop loss closely and consider early exit if trend continues',
+                'priority': 'high'
+            })
+        
+        # Time-basierte Empfehlungen
+        trade_duration = result.get('trade_duration', 0)
+        if trade_duration > 48:  # 2 Tage
+            recommendations.append({
+                'type': 'extended_trade_duration',
+                'message': f'Trade active for {trade_duration}h',
+                'suggestion': 'Review trade thesis and consider exit if original conditions changed',
+                'priority': 'medium'
+            })
+        
+        # Confidence-basierte Empfehlungen
+        confidence = result.get('confidence_score', 50)
+        if confidence < 30:
+            recommendations.append({
+                'type': 'low_confidence',
+                'message': f'Low confidence score: {confidence:.1f}',
+                'suggestion': 'Consider early exit or reducing position size',
+                'priority': 'medium'
+            })
+        
+        return recommendations
+
+    def _log_trade_status(self, result: Dict):
+        """Loggt detaillierten Trade-Status mit erweiterter Information"""
+        # Ohne aktives INFO-Level gar nicht erst formatieren — das Banner
+        # kostet sonst ~10 Format-Konvertierungen pro Tick für nichts
+        if not logger.isEnabledFor(logging.INFO):
+            return
+        try:
+            # Logge nur bei signifikanten Ereignissen oder regelmäßig
+            should_log = (
+                result['action'] != 'hold' or
+                self.performance_metrics.trades_evaluated % 20 == 0 or
+                abs(result['pnl_percentage']) > 5
+            )
+
+            if should_log:
+                logger.info(f"""
+📊 PROFESSIONAL TRADE EVALUATION: {result['symbol']}
+├ 💰 Entry: {result['entry_price']:,.2f} | Current: {result['current_price']:,.2f}
+├ 📈 PnL: {result['current_pnl']:+.2f} USDT ({result['pnl_percentage']:+.2f}%)
+├ ⚖️ Leverage: {result['leverage']}x | R/R: {result.get('risk_reward_ratio', 1.0):.2f}
+├ 🕒 Duration: {result.get('trade_duration', 0)}h | Confidence: {result.get('confidence_score', 50):.1f}
+├ 🎯 Action: {result['action'].upper()} | Reason: {result['reason']}
+├ 🔧 Status: {result['status']} | Volatility: {result.get('volatility_level', 0.03):.2%}
+└ 💡 Recommendations: {len(result.get('recommendations', []))}
+""")
+
+        except Exception as e:
+            logger.debug("⚠️ Error logging trade status: %s", e)
+
+    def _create_result(self, action: str, reason: str,
+                       timestamp_iso: Optional[str] = None, **kwargs) -> Dict[str, Any]:
+        """Erstellt ein standardisiertes Result-Dictionary"""
+        base_result = {
+            'action': action,
+            'reason': reason,
+            'timestamp': timestamp_iso or datetime.now().isoformat(),
+            'description': self._get_action_description(action, reason)
+        }
+        base_result.update(kwargs)
+        return base_result
+
+    def _get_action_description(self, action: str, reason: str) -> str:
+        """Gibt beschreibenden Text für Aktionen zurück"""
+        descriptions = {
+            'close': 'Close entire position',
+            'partial_close': 'Close portion of position',
+            'update_stoploss': 'Update stop loss level',
+            'hold': 'Maintain current position',
+            'none': 'No action required'
+        }
+        return descriptions.get(action, 'Unknown action')
+
+    def _update_performance_metrics(self, action: str, reason: str):
+        """Aktualisiert Performance-Metriken mit detailliertem Tracking"""
+        counter, outcome = _classify_reason(reason.lower())
+        if counter:
+            metrics = self.performance_metrics
+            setattr(metrics, counter, getattr(metrics, counter) + 1)
+            if outcome:
+                setattr(metrics, outcome, getattr(metrics, outcome) + 1)
+                # Outcome-Zähler haben sich geändert → Win-Rate einmal
+                # hier nachziehen (total ist nach dem Inkrement > 0)
+                total = metrics.successful_trades + metrics.failed_trades
+                self._win_rate = round(
+                    metrics.successful_trades / total * 100, 2
+                )
+
+    def get_performance_metrics(self) -> Dict[str, Any]:
+        """Gibt UM FASSENDE Performance-Metriken zurück.
+
+        Gibt bei unverändertem Zustand dieselbe gecachte Sicht zurück —
+        bitte nicht mutieren.
+        """
+        metrics = self.performance_metrics
+        uptime_hours = (time.monotonic_ns() - self._start_ns) // 3_600_000_000_000
+        cache_key = (
+            metrics.as_tuple(), len(self._hist_price),
+            len(self.volatility_cache), self._state_epoch, uptime_hours
+        )
+        if cache_key == self._metrics_cache_key:
+            return self._metrics_cache
+
+        # as_dict() liefert bereits ein frisches Dict — die Zusatzfelder
+        # direkt hineinschreiben statt eines zweiten **-Merges
+        snapshot = metrics.as_dict()
+        snapshot['total_trades_evaluated'] = metrics.trades_evaluated
+        snapshot['win_rate_percent'] = self._win_rate
+        snapshot['active_trades_monitored'] = len(self._hist_price)
+        snapshot['volatility_cache_size'] = len(self.volatility_cache)
+        snapshot['breakeven_activated_count'] = sum(
+            1 for state in self._state.values() if state & _STATE_BREAKEVEN
+        )
+        snapshot['trailing_stop_activated_count'] = sum(
+            1 for state in self._state.values() if state & _STATE_TRAILING
+        )
+        snapshot['system_uptime_hours'] = uptime_hours
+        self._metrics_cache = snapshot
+        self._metrics_cache_key = cache_key
+        self._publish_metrics_mmap()
+        return snapshot
+
+    def get_performance_metrics_json(self) -> str:
+        """Gibt den Metrik-Snapshot als JSON-String zurück.
+
+        Für Exporter/HTTP-Antworten: encodet über orjson falls verfügbar
+        (sonst stdlib json) und cached das Ergebnis pro Snapshot-Identität
+        — wiederholte Scrapes bei unverändertem Zustand kosten keinen
+        Encode.
+        """
+        snapshot = self.get_performance_metrics()
+        if snapshot is self._metrics_json_src:
+            return self._metrics_json
+
+        if orjson is not None:
+            encoded = orjson.dumps(snapshot).decode()
+        else:
+            encoded = json.dumps(snapshot)
+        self._metrics_json = encoded
+        self._metrics_json_src = snapshot
+        return encoded
+
+    def _publish_metrics_mmap(self):
+        """Spiegelt die Performance-Zähler in die mmap-Datei.
+
+        Läuft nur beim Neuaufbau eines Snapshots (nicht pro Scrape) und
+        schreibt die Werte als ein pack_into in den gemappten Puffer —
+        externe Prozesse lesen risk_metrics.bin direkt per mmap.
+        """
+        try:
+            if self._metrics_mmap is None:
+                with open(_METRICS_MMAP_FILE, 'wb') as f:
+                    f.write(b'\x00' * _METRICS_STRUCT.size)
+                with open(_METRICS_MMAP_FILE, 'r+b') as f:
+                    # mmap dupliziert den File-Deskriptor — die Datei
+                    # kann danach geschlossen werden
+                    self._metrics_mmap = mmap.mmap(f.fileno(), _METRICS_STRUCT.size)
+            _METRICS_STRUCT.pack_into(self._metrics_mmap, 0,
+                                      *self.performance_metrics.as_tuple())
+        except Exception as e:
+            logger.error("❌ Error publishing metrics to mmap file: %s", e)
+
+    def get_trade_recommendations(self, symbol: str) -> List[Dict[str, Any]]:
+        """Gibt spezifische Empfehlungen für einen Trade"""
+        try:
+            # Zuletzt evaluierten Tick-Preis nutzen (Dict-Read statt
+            # REST-Roundtrip); Fallback auf die API, wenn er fehlt oder
+            # älter als 10 Sekunden ist
+            cached = self._price_cache.get(symbol)
+            if cached is not None and time.monotonic() - cached[1] < 10.0:
+                current_price = cached[0]
+            else:
+                current_price = _get_binance_api().get_current_price(symbol)
+            result = self.evaluate_trade(symbol, current_price)
+            return result.get('recommendations', [])
+        except Exception as e:
+            logger.error("❌ Error getting trade recommendations for %s: %s", symbol, e)
+            return []
+
+    def get_all_recommendations(self) -> Dict[str, List[Dict[str, Any]]]:
+        """Gibt Empfehlungen für ALLE aktiven Trades mit EINEM Ticker-Abruf.
+
+        Statt eines REST-Calls pro Symbol (Dashboard-Schleife) holt ein
+        einziger Bulk-Abruf die Preise aller Symbole; evaluiert wird über
+        den Batch-Pfad mit einer DB-Query.
+        """
+        try:
+            active_trades = get_all_active_trades_db()
+            if not active_trades:
+                return {}
+
+            symbols = list(active_trades)
+            try:
+                prices = _get_binance_api().get_all_prices(symbols)
+            except Exception as e:
+                logger.error("❌ Error fetching bulk prices: %s", e)
+                prices = {}
+
+            current_prices = {s: prices[s] for s in symbols if prices.get(s)}
+            results = self.evaluate_trades_batch(current_prices)
+            return {
+                symbol: result.get('recommendations', [])
+                for symbol, result in results.items()
+            }
+        except Exception as e:
+            logger.error("❌ Error getting bulk recommendations: %s", e)
+            return {}
+
+    def reset_trade_state(self, symbol: str):
+        """Setzt den State für einen spezifischen Trade zurück"""
+        try:
+            self._state.pop(symbol, None)
+            self._state_epoch += 1
+            self._last_eval.pop(symbol, None)
+            self._hist_ts.pop(symbol, None)
+            self._hist_price.pop(symbol, None)
+            self._hist_sl.pop(symbol, None)
+            
+            logger.info("🔄 Reset trade state for %s", symbol)
+        except Exception as e:
+            logger.error("❌ Error resetting trade state for %s: %s", symbol, e)
+
+    def get_risk_parameters(self) -> Dict[str, Any]:
+        """Gibt aktuelle Risk Parameter zurück"""
+        return self.risk_parameters.copy()
+
+    def update_risk_parameters(self, new_parameters: Dict[str, Any]):
+        """Aktualisiert Risk Parameter mit Validierung"""
+        try:
+            for key, value in new_parameters.items():
+                validator = _PARAM_VALIDATORS.get(key)
+                if validator is None:
+                    continue
+                if validator(value):
+                    self.risk_parameters[key] = value
+                else:
+                    logger.warning("⚠️ Invalid value for %s: %s", key, value)
+
+            self._refresh_derived_thresholds()
+            # Gecachte 'hold'-Bewertungen basieren auf den ALTEN
+            # Schwellwerten — verwerfen, damit die neuen sofort greifen
+            self._last_eval.clear()
+            logger.info("✅ Risk parameters updated successfully")
+        except Exception as e:
+            logger.error("❌ Error updating risk parameters: %s", e)
+
+# Globale Instanz
 risk_manager = AdvancedRiskManager()
\ No newline at end of file
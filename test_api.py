@@ -1,13 +1,100 @@
+import threading
+import time
+
 from binance.client import Client
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 # Initialize the client with your Testnet keys
 api_key = ''
 api_secret = ''
-client = Client(api_key, api_secret, testnet=True)  # Critical for Testnet
+# timeout so a hanging call fails fast instead of masking the pooling gain
+client = Client(api_key, api_secret, testnet=True,
+                requests_params={'timeout': 3})  # Critical for Testnet
+
+# Mount a bigger connection pool on the client's session: keeps the TLS
+# connection alive between calls instead of re-handshaking per request
+_adapter = HTTPAdapter(
+    pool_connections=50,
+    pool_maxsize=50,
+    max_retries=Retry(total=2, backoff_factor=0.1,
+                      status_forcelist=[502, 503, 504]),
+)
+client.session.mount('https://', _adapter)
+client.session.mount('http://', _adapter)
+client.session.headers.update({'Connection': 'keep-alive'})
+
+# Regional REST endpoints (api1..api3) can be dramatically closer than
+# api.binance.com depending on the network. Ping each once and keep the
+# fastest one.
+_API_CANDIDATES = (
+    'https://api.binance.com/api',
+    'https://api1.binance.com/api',
+    'https://api2.binance.com/api',
+    'https://api3.binance.com/api',
+)
+
+def _endpoint_rtt(url):
+    start = time.perf_counter()
+    try:
+        client.session.get(url + '/v3/ping', timeout=1)
+        return time.perf_counter() - start
+    except Exception:
+        return float('inf')
+
+def select_fastest_endpoint():
+    """Points client.API_URL at the lowest-RTT mainnet endpoint.
+
+    Testnet only has a single endpoint, so for a testnet client
+    (like the one above) the URL is left untouched.
+    """
+    if getattr(client, 'testnet', False):
+        return client.API_URL
+    client.API_URL = min(_API_CANDIDATES, key=_endpoint_rtt)
+    return client.API_URL
+
+class ConnectionKeeper:
+    """Background pinger that keeps the pooled connection hot.
+
+    Binance's load balancer tears down idle connections after ~60s, so
+    any call after a quiet period pays a fresh TLS handshake. A ping
+    every 30s keeps the keep-alive socket (and its TLS session) cached
+    inside the connection pool.
+    """
+
+    def __init__(self, client, interval=30.0):
+        self.client = client
+        self.interval = interval
+        self._stop_event = threading.Event()
+        self._thread = None
+
+    def start(self):
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self._run, daemon=True,
+                                        name="ConnectionKeeper")
+        self._thread.start()
+
+    def stop(self):
+        self._stop_event.set()
+
+    def _run(self):
+        while not self._stop_event.wait(self.interval):
+            try:
+                self.client.ping()
+            except Exception as e:
+                print(f"   ⚠️ Keep-alive ping failed: {e}")
 
 def test_api_connection():
     print("=== Testing Binance Testnet API Connection ===\n")
-    
+
+    # Pick the fastest regional endpoint first (no-op on testnet)
+    print(f"Using endpoint: {select_fastest_endpoint()}\n")
+
+    # Keep the connection warm across (and between) the test calls
+    keeper = ConnectionKeeper(client)
+    keeper.start()
+
     try:
         # Test 1: Basic Connection & Server Time
         print("1. Testing server connection...")
@@ -57,6 +144,8 @@ def test_api_connection():
         # This helps pinpoint where the failure occurred
         import traceback
         traceback.print_exc()
+    finally:
+        keeper.stop()
 
 if __name__ == "__main__":
 